@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0002_feedback'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KtcPlayerWeeklyValues',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ktc_value', models.IntegerField(db_column='ktc_value')),
+                ('date', models.DateField(db_column='date')),
+                ('ktc_player_id', models.ForeignKey(db_column='ktc_player_id', on_delete=django.db.models.deletion.CASCADE, to='fantasy_trades_app.players', to_field='ktc_player_id')),
+            ],
+            options={
+                'unique_together': {('ktc_player_id', 'date')},
+            },
+        ),
+    ]
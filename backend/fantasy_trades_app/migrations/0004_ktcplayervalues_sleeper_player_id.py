@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+BATCH_SIZE = 50000
+
+
+def backfill_sleeper_player_id(apps, schema_editor):
+    """Copy Players.sleeper_player_id onto the existing value rows, one id range per statement."""
+    Players = apps.get_model('fantasy_trades_app', 'Players')
+    KtcPlayerValues = apps.get_model('fantasy_trades_app', 'KtcPlayerValues')
+
+    sleeper_player_id = Subquery(
+        Players.objects.filter(ktc_player_id=OuterRef('ktc_player_id')).values('sleeper_player_id')[:1]
+    )
+    last_id = KtcPlayerValues.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        (KtcPlayerValues.objects.filter(id__gte=start, id__lt=start + BATCH_SIZE)
+         .update(sleeper_player_id=sleeper_player_id))
+
+
+class Migration(migrations.Migration):
+    # each backfill batch commits on its own
+    atomic = False
+
+    dependencies = [
+        ('fantasy_trades_app', '0003_ktcplayerweeklyvalues'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ktcplayervalues',
+            name='sleeper_player_id',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_sleeper_player_id, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='players',
+            name='sleeper_player_id',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='ktcplayervalues',
+            index=models.Index(fields=['sleeper_player_id', 'date'], name='ktc_values_sleeper_date_idx'),
+        ),
+    ]
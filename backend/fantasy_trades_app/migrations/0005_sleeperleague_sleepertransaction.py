@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0004_ktcplayervalues_sleeper_player_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SleeperLeague',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sleeper_league_id', models.CharField(max_length=32, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('season', models.CharField(max_length=4)),
+                ('status', models.CharField(max_length=32)),
+                ('previous_league_id', models.CharField(blank=True, max_length=32, null=True)),
+                ('last_synced_week', models.IntegerField(blank=True, null=True)),
+                ('synced_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SleeperTransaction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('transaction_id', models.CharField(max_length=32, unique=True)),
+                ('week', models.IntegerField()),
+                ('position', models.IntegerField()),
+                ('created_at_millis', models.BigIntegerField()),
+                ('roster_ids', models.JSONField()),
+                ('adds', models.JSONField()),
+                ('draft_picks', models.JSONField()),
+                ('waiver_budget', models.JSONField()),
+                ('sleeper_league_id', models.ForeignKey(db_column='sleeper_league_id', on_delete=django.db.models.deletion.CASCADE, to='fantasy_trades_app.sleeperleague', to_field='sleeper_league_id')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sleeper_league_id', 'week', 'position'], name='sleeper_txn_league_week_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0005_sleeperleague_sleepertransaction'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='sleeperleague',
+            name='previous_league_id',
+            field=models.CharField(blank=True, db_index=True, max_length=32, null=True),
+        ),
+    ]
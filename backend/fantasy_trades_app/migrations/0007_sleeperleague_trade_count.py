@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_trade_count(apps, schema_editor):
+    SleeperLeague = apps.get_model('fantasy_trades_app', 'SleeperLeague')
+    SleeperTransaction = apps.get_model('fantasy_trades_app', 'SleeperTransaction')
+
+    SleeperLeague.objects.update(trade_count=Coalesce(Subquery(
+        SleeperTransaction.objects
+        .filter(sleeper_league_id=OuterRef('sleeper_league_id'))
+        .values('sleeper_league_id')
+        .annotate(trade_count=Count('id'))
+        .values('trade_count')[:1]
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0006_sleeperleague_previous_league_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sleeperleague',
+            name='trade_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_trade_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='sleepertransaction',
+            index=models.Index(fields=['sleeper_league_id', 'created_at_millis', 'transaction_id'], name='sleeper_txn_league_sort_idx'),
+        ),
+    ]
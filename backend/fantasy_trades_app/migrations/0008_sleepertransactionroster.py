@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:22
+
+import django.db.models.deletion
+from collections import Counter
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def backfill_rosters(apps, schema_editor):
+    """Index the synced trades by roster and count them per roster, one league at a time."""
+    SleeperLeague = apps.get_model('fantasy_trades_app', 'SleeperLeague')
+    SleeperTransaction = apps.get_model('fantasy_trades_app', 'SleeperTransaction')
+    SleeperTransactionRoster = apps.get_model('fantasy_trades_app', 'SleeperTransactionRoster')
+
+    for league in SleeperLeague.objects.all():
+        rows = (SleeperTransaction.objects
+                .filter(sleeper_league_id=league.sleeper_league_id)
+                .values_list('id', 'created_at_millis', 'transaction_id', 'roster_ids'))
+        transaction_rosters: list = [
+            SleeperTransactionRoster(sleeper_transaction_id=sleeper_transaction_id,
+                                     sleeper_league_id=league.sleeper_league_id, roster_id=roster_id,
+                                     created_at_millis=created_at_millis, transaction_id=transaction_id)
+            for sleeper_transaction_id, created_at_millis, transaction_id, roster_ids in rows
+            for roster_id in roster_ids
+        ]
+        SleeperTransactionRoster.objects.bulk_create(transaction_rosters, batch_size=BATCH_SIZE)
+
+        league.roster_trade_counts = dict(Counter(str(row.roster_id) for row in transaction_rosters))
+        league.save(update_fields=['roster_trade_counts'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0007_sleeperleague_trade_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sleeperleague',
+            name='roster_trade_counts',
+            field=models.JSONField(default=dict),
+        ),
+        migrations.CreateModel(
+            name='SleeperTransactionRoster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sleeper_league_id', models.CharField(max_length=32)),
+                ('roster_id', models.IntegerField()),
+                ('created_at_millis', models.BigIntegerField()),
+                ('transaction_id', models.CharField(max_length=32)),
+                ('sleeper_transaction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rosters', to='fantasy_trades_app.sleepertransaction')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sleeper_league_id', 'roster_id', 'created_at_millis', 'transaction_id'], name='sleeper_txn_roster_sort_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_rosters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0008_sleepertransactionroster'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KtcIngestion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(unique=True)),
+                ('published_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0009_ktcingestion'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='sleepertransactionroster',
+            constraint=models.UniqueConstraint(fields=('sleeper_transaction', 'roster_id'), name='sleeper_txn_roster_unique'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:51
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0010_sleepertransactionroster_unique'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='ktcplayervalues',
+            name='ktc_values_sleeper_date_idx',
+        ),
+        migrations.RemoveField(
+            model_name='ktcplayervalues',
+            name='sleeper_player_id',
+        ),
+    ]
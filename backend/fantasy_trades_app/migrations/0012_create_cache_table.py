@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:20
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_table(apps, schema_editor):
+    # the shared cache tier when REDIS_URL is not set, does nothing for other cache backends
+    call_command('createcachetable', database=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fantasy_trades_app', '0011_remove_ktcplayervalues_sleeper_player_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_table, migrations.RunPython.noop),
+    ]
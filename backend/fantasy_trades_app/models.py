@@ -5,7 +5,7 @@ class Players(models.Model):
     id = models.AutoField(primary_key=True)
     ktc_player_id = models.IntegerField(null=True, blank=True, unique=True)
     player_name = models.CharField(max_length=255)
-    sleeper_player_id = models.IntegerField(null=True, blank=True)
+    sleeper_player_id = models.IntegerField(null=True, blank=True, db_index=True)
     age = models.IntegerField(null=True, blank=True)
     number = models.IntegerField(null=True, blank=True)
     position = models.CharField(max_length=32, null=True, blank=True)
@@ -33,6 +33,103 @@ class KtcPlayerValues(models.Model):
         return f"{self.ktc_player_id.player_name} - {self.ktc_value} on {self.date}"
 
 
+class KtcPlayerWeeklyValues(models.Model):
+    """The first KtcPlayerValues row of every week, weeks are split at month boundaries. Refreshed by ingestion."""
+    ktc_player_id = models.ForeignKey(
+        Players,
+        to_field='ktc_player_id',
+        on_delete=models.CASCADE,
+        db_column='ktc_player_id'
+    )
+    ktc_value = models.IntegerField(db_column='ktc_value')
+    date = models.DateField(db_column='date')
+
+    class Meta:
+        unique_together = ('ktc_player_id', 'date')
+
+    def __str__(self):
+        return f"{self.ktc_player_id.player_name} - {self.ktc_value} week of {self.date}"
+
+
+class KtcIngestion(models.Model):
+    """A KTC ingestion published by value_store.publish(), the newest version labels the value store."""
+    version = models.BigIntegerField(unique=True)
+    published_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"KTC ingestion {self.version} published {self.published_at}"
+
+
+class SleeperLeague(models.Model):
+    """
+    A Sleeper league season, every season of a league has its own sleeper_league_id chained by
+    previous_league_id. Synced by frontend_api/transaction_store/sync.py.
+    """
+    sleeper_league_id = models.CharField(max_length=32, unique=True)
+    name = models.CharField(max_length=255)
+    season = models.CharField(max_length=4)
+    status = models.CharField(max_length=32)
+    previous_league_id = models.CharField(max_length=32, null=True, blank=True, db_index=True)
+    last_synced_week = models.IntegerField(null=True, blank=True)  # None until the first sync
+    synced_at = models.DateTimeField(null=True, blank=True)
+    trade_count = models.IntegerField(default=0)  # SleeperTransaction rows of the league, updated by the sync
+    roster_trade_counts = models.JSONField(default=dict)  # roster_id -> trade count, updated by the sync
+
+    def __str__(self):
+        return f"{self.name} {self.season}"
+
+
+class SleeperTransaction(models.Model):
+    """A completed trade of a league season, as returned by Sleeper's transactions endpoint."""
+    transaction_id = models.CharField(max_length=32, unique=True)
+    sleeper_league_id = models.ForeignKey(
+        SleeperLeague,
+        to_field='sleeper_league_id',
+        on_delete=models.CASCADE,
+        db_column='sleeper_league_id'
+    )
+    week = models.IntegerField()
+    position = models.IntegerField()  # order within the week's transactions
+    created_at_millis = models.BigIntegerField()
+    roster_ids = models.JSONField()
+    adds = models.JSONField()
+    draft_picks = models.JSONField()
+    waiver_budget = models.JSONField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sleeper_league_id', 'week', 'position'], name='sleeper_txn_league_week_idx'),
+            # keyset pagination, newest first
+            models.Index(fields=['sleeper_league_id', 'created_at_millis', 'transaction_id'],
+                         name='sleeper_txn_league_sort_idx')
+        ]
+
+    def __str__(self):
+        return f"{self.transaction_id} - week {self.week} of {self.sleeper_league_id_id}"
+
+
+class SleeperTransactionRoster(models.Model):
+    """A SleeperTransaction once per roster in it, to page through a roster's trades. Maintained by the sync."""
+    sleeper_transaction = models.ForeignKey(SleeperTransaction, on_delete=models.CASCADE, related_name='rosters')
+    sleeper_league_id = models.CharField(max_length=32)
+    roster_id = models.IntegerField()
+    # copies of the transaction's sort key for keyset pagination
+    created_at_millis = models.BigIntegerField()
+    transaction_id = models.CharField(max_length=32)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['sleeper_league_id', 'roster_id', 'created_at_millis', 'transaction_id'],
+                         name='sleeper_txn_roster_sort_idx')
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['sleeper_transaction', 'roster_id'], name='sleeper_txn_roster_unique')
+        ]
+
+    def __str__(self):
+        return f"{self.transaction_id} - roster {self.roster_id}"
+
+
 from django.db import models
 
 class Feedback(models.Model):
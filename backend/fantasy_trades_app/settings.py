@@ -100,6 +100,10 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'fantasy_trades_app.wsgi.application'
+ASGI_APPLICATION = 'fantasy_trades_app.asgi.application'
+
+# Serve get_league_trades, get_leaderboard and get_leagues with async views, only enable when running under ASGI
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', 'False') == 'True'
 
 
 # Database
@@ -161,6 +165,22 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 SLEEPER_API_URL = "https://api.sleeper.app/v1"
 
+# Sleeper HTTP client, see sleeper_api/sleeper_api_svc.py
+SLEEPER_API_CONNECT_TIMEOUT = float(os.environ.get('SLEEPER_API_CONNECT_TIMEOUT', 3.05))  # seconds
+SLEEPER_API_READ_TIMEOUT = float(os.environ.get('SLEEPER_API_READ_TIMEOUT', 10))  # seconds
+SLEEPER_API_MAX_RETRIES = int(os.environ.get('SLEEPER_API_MAX_RETRIES', 3))
+SLEEPER_API_BACKOFF_BASE = 0.25  # seconds, doubled every retry
+SLEEPER_API_BACKOFF_MAX = 5  # seconds
+SLEEPER_API_POOL_SIZE = int(os.environ.get('SLEEPER_API_POOL_SIZE', 32))  # keep-alive connections per host
+SLEEPER_API_MAX_CONCURRENCY = int(os.environ.get('SLEEPER_API_MAX_CONCURRENCY', 16))  # parallel fetches per request
+SLEEPER_API_CALLS_PER_MINUTE = int(os.environ.get('SLEEPER_API_CALLS_PER_MINUTE', 900))  # Sleeper allows ~1000
+SLEEPER_API_BACKGROUND_RESERVE = 300  # tokens background calls leave for interactive calls
+# the budgets above are for the whole host, every worker process rate limits its own share of them
+# without a round trip to the shared cache per call, set to the number of server worker processes
+SLEEPER_API_WORKER_PROCESSES = max(1, int(os.environ.get('WEB_CONCURRENCY', 1)))
+SLEEPER_API_BREAKER_FAILURES = 5  # consecutive failed calls before failing fast
+SLEEPER_API_BREAKER_RESET_TIMEOUT = 30  # seconds before a trial call is let through
+
 import os
 
 LOGGING = {
@@ -187,13 +207,43 @@ LOGGING = {
     },
 }
 
+# Two tier cache, see frontend_api/cache/tiered_cache.py. The shared tier is Redis when REDIS_URL is set,
+# otherwise a table in the database (created by migration 0012). A file based cache would list its whole
+# directory on every set to cull it, the database cache only counts its rows
+REDIS_URL = os.environ.get('REDIS_URL')
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+        'BACKEND': 'frontend_api.cache.tiered_cache.TieredCache',
+        'LOCATION': 'fantasy-trades-local',
+        'OPTIONS': {
+            'SHARED_CACHE': 'shared',
+            'LOCAL_MAX_BYTES': int(os.environ.get('CACHE_LOCAL_MAX_BYTES', 128 * 1024 * 1024)),
+            'LOCAL_TIMEOUT': 60,  # seconds, how long a value written by another worker can go unnoticed
+        }
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'fantasy_trades_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        }
     }
 }
 
+# Also coordinate concurrent Sleeper fetches of the same cache key across worker processes with a
+# lock entry in the cache, only useful with a cache shared between workers
+SINGLE_FLIGHT_CACHE_LOCK = os.environ.get('SINGLE_FLIGHT_CACHE_LOCK', str(bool(REDIS_URL))) == 'True'
+SINGLE_FLIGHT_LOCK_TIMEOUT = 15  # seconds
+CACHE_REFRESH_WORKERS = 4  # threads refreshing cache entries past their soft ttl
+KTC_VALUE_STORE_CHECK_INTERVAL = 30  # seconds between checks for newly ingested KTC values
+KTC_SNAPSHOT_PATH = os.environ.get('KTC_SNAPSHOT_PATH', os.path.join(BASE_DIR, 'ktc_snapshot.bin'))
+TRANSACTION_SYNC_INTERVAL = 60 * 15  # seconds before an in-season league's trades are synced again
+TRANSACTION_SYNC_WORKERS = 2  # threads syncing league trades into the database
+
 VERSION = '1.0.0'
 
 # settings.py
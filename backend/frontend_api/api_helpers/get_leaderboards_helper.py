@@ -1,85 +1,134 @@
 import json
+from datetime import date
 
+from django.http import HttpRequest
 from requests import Request
-from typing import List, Dict, Any
 from frontend_api.api_helpers import get_trades_api_helper
+from frontend_api.cache import leaderboard_state
+from frontend_api.errors import InvalidRequestError
+from frontend_api.ktc_store import value_store
+from frontend_api.ktc_store.value_store import KtcValueStore
+from frontend_api.models import LeagueUser
 from logger_util import logger
 
 
 def get_leaderboard(request: Request, sleeper_league_id: str) -> json:
-    # fetch all trades
-    trade_values_result: json = get_trades_api_helper.get_trades(request=request,
-                                                                 sleeper_league_id=sleeper_league_id,
-                                                                 roster_id='all',
-                                                                 transaction_id=None,
-                                                                 paginate=False)
+    """
+    Rank a league's rosters by the net value of their trades.
 
-    logger.info(f"getting leaderboards on {len(trade_values_result['trades'])} trades")
+    Rankings come from the league's leaderboard state, which only values trades it has not seen and
+    trades of a new KTC ingestion. The request may narrow the rankings to a season (season=2024) or a
+    date window (startDate=2024-09-01&endDate=2024-12-31, both optional and inclusive).
 
-    return calculate_leaderboard(trade_values_result)
+    best_trade and worst_trade are trade references unless the request has expand=trades, then they are
+    the trades as returned by get_trades.
+    """
+    window: tuple = get_window(request)
+    league_data, league_users, previous_leagues, league_index, all_trades = \
+        get_trades_api_helper.get_league_trades(sleeper_league_id)
+    ktc_store: KtcValueStore = value_store.get_store()
 
+    logger.info(f"getting leaderboards on {len(all_trades)} trades")
 
-MAX_WORST_TRADE_NET = float('inf')  # Use a constant for max worst trade net
-MIN_BEST_TRADE_NET = 0  # Use a constant for min best trade net
+    state: json = leaderboard_state.get_data(
+        sleeper_league_id, get_seasons(league_data, previous_leagues), league_index, all_trades, ktc_store,
+        lambda trades: get_trades_api_helper.calculate_trade_totals(league_index, trades, ktc_store)
+    )
+    leaderboard: json = build_leaderboard(league_data, league_users, state, *window)
 
-def calculate_leaderboard(trades_result: Dict[str, Any]) -> Dict[str, Any]:
-    leaderboard_dict = {
-        "league_id": trades_result['league_id'],
-        "league_name": trades_result['league_name'],
-        "league_avatar": trades_result['league_avatar'],
-        "league_users": trades_result['league_users'],
-        "rankings": []
-    }
+    expanded_trades: dict = {}
+    if is_expanded(request):
+        expanded_trades = index_by_transaction_id(get_trades_api_helper.get_valued_trades(
+            get_referenced_trades(leaderboard, all_trades), league_index, ktc_store
+        ))
+
+    return set_trade_references(leaderboard, expanded_trades)
+
+
+async def aget_leaderboard(request: HttpRequest, sleeper_league_id: str) -> json:
+    window: tuple = get_window(request)
+    league_data, league_users, previous_leagues, league_index, all_trades = \
+        await get_trades_api_helper.aget_league_trades(sleeper_league_id)
+    ktc_store: KtcValueStore = await value_store.aget_store()
+
+    logger.info(f"getting leaderboards on {len(all_trades)} trades")
+
+    state: json = await leaderboard_state.aget_data(
+        sleeper_league_id, get_seasons(league_data, previous_leagues), league_index, all_trades, ktc_store,
+        lambda trades: get_trades_api_helper.calculate_trade_totals(league_index, trades, ktc_store)
+    )
+    leaderboard: json = build_leaderboard(league_data, league_users, state, *window)
+
+    expanded_trades: dict = {}
+    if is_expanded(request):
+        expanded_trades = index_by_transaction_id(await get_trades_api_helper.aget_valued_trades(
+            get_referenced_trades(leaderboard, all_trades), league_index, ktc_store
+        ))
 
-    temp_rankings = initialize_temp_rankings(trades_result['league_users'])
+    return set_trade_references(leaderboard, expanded_trades)
 
-    for trade in trades_result['trades']:
-        if len(trade['roster_ids']) != 2:
-            continue
 
-        roster_trade_values = calculate_trade_values(trade)
-        update_rankings(temp_rankings, trade, roster_trade_values)
+def is_expanded(request) -> bool:
+    return request.GET.get('expand') == 'trades'
 
-    leaderboard_dict['rankings'] = sorted(temp_rankings.values(), key=lambda x: x['total_net_value'], reverse=True)
 
-    return leaderboard_dict
+def get_window(request) -> tuple[str | None, str | None, str | None]:
+    """
+    (season, start date, end date) the request ranks trades over, dates as 'YYYY-MM-DD'.
 
-def initialize_temp_rankings(league_users: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
-    rankings = {}
-    for user in league_users:
-        rankings[user['roster_id']] = {
-            "username": user['user_name'],
-            "roster_id": user['roster_id'],
-            "user_id": user['user_id'],
-            "total_net_value": 0,
-            "total_trades": 0,
-            "worst_trade_net": MAX_WORST_TRADE_NET,
-            "best_trade_net": MIN_BEST_TRADE_NET,
-            "worst_trade": None,
-            "best_trade": None
-        }
-    return rankings
+    :raises InvalidRequestError: startDate or endDate is not a date.
+    """
+    return request.GET.get('season'), parse_date(request, 'startDate'), parse_date(request, 'endDate')
 
-def calculate_trade_values(trade: Dict[str, Any]) -> Dict[int, float]:
-    roster_id_1, roster_id_2 = trade['roster_ids']
-    roster_trade_1 = trade[roster_id_1]
-    roster_trade_2 = trade[roster_id_2]
 
-    net_value_1 = roster_trade_1['total_current_value'] - roster_trade_2['total_current_value']
-    net_value_2 = roster_trade_2['total_current_value'] - roster_trade_1['total_current_value']
+def parse_date(request, param: str) -> str | None:
+    value: str = request.GET.get(param)
+    if value is None:
+        return None
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise InvalidRequestError(f"Invalid {param} '{value}', expected YYYY-MM-DD")
 
-    return {roster_id_1: net_value_1, roster_id_2: net_value_2}
 
-def update_rankings(temp_rankings: Dict[int, Dict[str, Any]], trade: Dict[str, Any], trade_values: Dict[int, float]) -> None:
-    for roster_id, net_value in trade_values.items():
-        temp_rankings[roster_id]['total_net_value'] += net_value
-        temp_rankings[roster_id]['total_trades'] += 1
+def get_seasons(league_data: json, previous_leagues: list) -> dict:
+    """league ID -> season of the league and every league before it."""
+    seasons: dict = {previous_league['previous_league_id']: previous_league['season']
+                     for previous_league in previous_leagues}
+    seasons[league_data['league_id']] = league_data['season']
+    return seasons
+
+
+def build_leaderboard(league_data: json, league_users: list[LeagueUser], state: json, season: str | None,
+                      start_date: str | None, end_date: str | None) -> json:
+    league_users_json: list = LeagueUser.to_json(league_users)
+    return {
+        'league_id': league_data['league_id'],
+        'league_name': league_data['name'],
+        'league_avatar': league_data['avatar'],
+        'league_users': league_users_json,
+        'rankings': leaderboard_state.get_rankings(state, league_users_json, season, start_date, end_date)
+    }
+
+
+def get_referenced_trades(leaderboard: json, all_trades: list) -> list:
+    transaction_ids: set = {
+        ranking[trade_key]['transaction_id']
+        for ranking in leaderboard['rankings'] for trade_key in ('best_trade', 'worst_trade')
+        if ranking[trade_key] is not None
+    }
+    return [trade for trade in all_trades if trade['transaction_id'] in transaction_ids]
+
 
-        if net_value < temp_rankings[roster_id]['worst_trade_net']:
-            temp_rankings[roster_id]['worst_trade_net'] = net_value
-            temp_rankings[roster_id]['worst_trade'] = trade
+def index_by_transaction_id(trades: list) -> dict:
+    return {trade['transaction_id']: trade for trade in trades}
 
-        if net_value > temp_rankings[roster_id]['best_trade_net']:
-            temp_rankings[roster_id]['best_trade_net'] = net_value
-            temp_rankings[roster_id]['best_trade'] = trade
 
+def set_trade_references(leaderboard: json, expanded_trades: dict) -> json:
+    """Replace the rankings' best and worst trade references with the expanded trade."""
+    for ranking in leaderboard['rankings']:
+        for trade_key in ('best_trade', 'worst_trade'):
+            trade_reference = ranking[trade_key]
+            if trade_reference is not None:
+                ranking[trade_key] = expanded_trades.get(trade_reference['transaction_id'], trade_reference)
+    return leaderboard
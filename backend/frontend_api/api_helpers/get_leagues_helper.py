@@ -16,6 +16,22 @@ def get_leagues(username: str) -> list[json]:
         season=str(datetime.now().year)
     )
 
+    return transform_user_leagues(user_leagues)
+
+
+async def aget_leagues(username: str) -> list[json]:
+    user_info: json = await sleeper_api_svc.aget_user_info(username=username)
+
+    user_leagues: json = await sleeper_api_svc.aget_user_leagues(
+        user_id=user_info['user_id'],
+        sport='nfl',
+        season=str(datetime.now().year)
+    )
+
+    return transform_user_leagues(user_leagues)
+
+
+def transform_user_leagues(user_leagues: json) -> list[json]:
     user_leagues: list[json] = [
         {
             'league_id': user_league['league_id'],
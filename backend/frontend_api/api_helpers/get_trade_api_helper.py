@@ -1,5 +1,45 @@
+import json
 
+from frontend_api.api_helpers import get_trades_api_helper
+from frontend_api.cache import get_transactions_data
+from frontend_api.ktc_store import value_store
+from frontend_api.ktc_store.value_store import KtcValueStore
+from frontend_api.models import LeagueUser
+from frontend_api.transaction_store import index
+from logger_util import logger
 
-def get_trade_data(transaction_id):
 
-    return {}
+def get_trade_data(transaction_id: str) -> json:
+    """
+    Value a single trade found through the transaction index, without loading its league's other trades.
+
+    :return: The trade as returned by get_trades with its league, None if the trade is not indexed.
+    """
+    entry: json = index.lookup(transaction_id)
+    if entry is None:
+        return None
+
+    logger.info(f"Getting trade {transaction_id} of sleeper league {entry['sleeper_league_id']} week {entry['week']}")
+
+    trade: json = entry['trade'] or find_trade(entry, transaction_id)
+    if trade is None:
+        return None
+
+    league_data, league_users, _, league_index = get_trades_api_helper.get_league(entry['league_id'])
+    ktc_store: KtcValueStore = value_store.get_store()
+
+    return {
+        'league_id': league_data['league_id'],
+        'league_name': league_data['name'],
+        'league_season': league_data['season'],
+        'league_avatar': league_data['avatar'],
+        'season': entry['season'],
+        'league_users': LeagueUser.to_json(league_users),
+        'trade': get_trades_api_helper.get_valued_trades([trade], league_index, ktc_store)[0]
+    }
+
+
+def find_trade(entry: json, transaction_id: str) -> json:
+    """Read a trade that is not synced yet from its week, None if it is no longer there."""
+    week_trades: list = get_transactions_data.week_trades_resource.get(entry['sleeper_league_id'], entry['week'])
+    return next((trade for trade in week_trades if trade['transaction_id'] == transaction_id), None)
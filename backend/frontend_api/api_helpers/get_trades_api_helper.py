@@ -1,24 +1,83 @@
+import asyncio
 import json
-from collections import defaultdict
-from datetime import datetime
+from datetime import date
+from itertools import islice
 
-from django.core.paginator import Paginator
-from django.db.models import QuerySet
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
 from rest_framework.request import Request
 
-from fantasy_trades_app.models import Players, KtcPlayerValues
-from frontend_api.cache import get_drafts_data, get_draft_picks_data, get_league_users, get_transactions_data
-from frontend_api.cache.get_league_data import get_league_data
-from frontend_api.models import LeagueUser
+from frontend_api.cache import get_league_draft_index, get_league_history, get_league_users, get_transactions_data, \
+    valued_trades
+from frontend_api.cache.get_league_data import get_league_data, aget_league_data
+from frontend_api.ktc_store import value_store
+from frontend_api.ktc_store.value_store import KtcValueStore
+from frontend_api.models import LeagueIndex, LeagueUser
+from frontend_api.transaction_store import index, pages
 from logger_util import logger
 
 PAGE_SIZE = 50
+FUTURE_DRAFT_PICK_TIER = 'Mid'  # future picks are valued as mid round picks
 
 
 def get_trades(request: Request, sleeper_league_id: str, roster_id: str = 'all', transaction_id: str = None, paginate: bool = True) -> json:
+    """
+    Get a page of a league's trades, newest first. Pages are requested by number (page) or with the
+    next_cursor of the previous page (cursor), only the trades up to the page are read.
+    """
     page: int = request.GET.get('page', 1)
+    cursor: str = request.GET.get('cursor')
     logger.info(f"Getting league trades for league: {sleeper_league_id}, roster_id: {roster_id}, page: {page}")
 
+    league_data, league_users, previous_leagues, league_index = get_league(sleeper_league_id)
+
+    seasons: list = get_transactions_data.get_seasons(
+        get_league_history.get_league_ids(sleeper_league_id, previous_leagues),
+        get_completed_league_ids(league_data, previous_leagues)
+    )
+
+    paginated_trades, page_info = paginate_trades(seasons, roster_id, page, paginate, transaction_id, cursor)
+
+    ktc_store: KtcValueStore = value_store.get_store()
+
+    # loop over trades and build response
+    trades_with_ktc_values: list = get_valued_trades(paginated_trades, league_index, ktc_store)
+
+    return build_trades_result(league_data, league_users, previous_leagues, roster_id, page_info,
+                               trades_with_ktc_values)
+
+
+async def aget_trades(request: HttpRequest, sleeper_league_id: str, roster_id: str = 'all', transaction_id: str = None, paginate: bool = True) -> json:
+    """
+    Async version of get_trades.
+
+    Sleeper data is fetched through the async client without holding a thread, KTC values come from
+    the in-memory value store.
+    """
+    page: int = request.GET.get('page', 1)
+    cursor: str = request.GET.get('cursor')
+    logger.info(f"Getting league trades for league: {sleeper_league_id}, roster_id: {roster_id}, page: {page}")
+
+    league_data, league_users, previous_leagues, league_index, seasons = \
+        await aget_league_with(sleeper_league_id, get_transactions_data.aget_seasons)
+
+    paginated_trades, page_info = await sync_to_async(paginate_trades)(seasons, roster_id, page, paginate,
+                                                                       transaction_id, cursor)
+
+    ktc_store: KtcValueStore = await value_store.aget_store()
+
+    trades_with_ktc_values: list = await aget_valued_trades(paginated_trades, league_index, ktc_store)
+
+    return build_trades_result(league_data, league_users, previous_leagues, roster_id, page_info,
+                               trades_with_ktc_values)
+
+
+def get_league(sleeper_league_id: str) -> tuple[json, list[LeagueUser], list, LeagueIndex.LeagueIndex]:
+    """
+    Get a league with everything its trades are valued with, without its trades.
+
+    :return: (league_data, league_users, previous_leagues, league_index)
+    """
     # get sleeper league data
     league_data: json = get_league_data(sleeper_league_id)
 
@@ -26,10 +85,58 @@ def get_trades(request: Request, sleeper_league_id: str, roster_id: str = 'all',
     league_users: list[LeagueUser] = get_league_users.get_data(sleeper_league_id)
 
     # Get previous_league_ids
-    previous_leagues: list = get_previous_league_ids(league_data)
+    previous_leagues: list = get_league_history.get_data(league_data)
+
+    # get the league's cached draft lookups
+    draft_index: json = get_league_draft_index.get_data(sleeper_league_id)
+
+    return league_data, league_users, previous_leagues, LeagueIndex.from_league(league_users, draft_index)
+
+
+def get_league_trades(sleeper_league_id: str) -> tuple[json, list[LeagueUser], list, LeagueIndex.LeagueIndex, list]:
+    """
+    Get a league and every trade in its history.
+
+    :return: (league_data, league_users, previous_leagues, league_index, all_trades)
+    """
+    league_data, league_users, previous_leagues, league_index = get_league(sleeper_league_id)
+
+    logger.info(
+        f"Getting transactions from sleeper league: "
+        f"id={sleeper_league_id} "
+        f"name={league_data['name']},"
+        f" league_history_count={len(previous_leagues)}"
+    )
+
+    # Get trades from current league and previous leagues history, every season's weeks are fetched together
+    all_trades: list = get_transactions_data.get_data_for_leagues(
+        get_league_history.get_league_ids(sleeper_league_id, previous_leagues),
+        get_completed_league_ids(league_data, previous_leagues)
+    )
+
+    return league_data, league_users, previous_leagues, league_index, all_trades
 
-    # get draft data
-    draft_data: dict = get_draft_data(sleeper_league_id, previous_leagues)
+
+async def aget_league_trades(sleeper_league_id: str) -> tuple[json, list[LeagueUser], list, LeagueIndex.LeagueIndex,
+                                                              list]:
+    return await aget_league_with(sleeper_league_id, get_transactions_data.aget_data_for_leagues)
+
+
+async def aget_league_with(sleeper_league_id: str, aget_trades_data) -> tuple[json, list[LeagueUser], list,
+                                                                             LeagueIndex.LeagueIndex, object]:
+    """
+    Get a league as in get_league, and its trades concurrently with its drafts.
+
+    :param aget_trades_data: Called with the league's seasons and its completed seasons, as
+                             get_transactions_data.aget_data_for_leagues or aget_seasons.
+    :return: (league_data, league_users, previous_leagues, league_index, the result of aget_trades_data)
+    """
+    league_data, league_users = await asyncio.gather(
+        aget_league_data(sleeper_league_id),
+        get_league_users.aget_data(sleeper_league_id)
+    )
+
+    previous_leagues: list = await get_league_history.aget_data(league_data)
 
     logger.info(
         f"Getting transactions from sleeper league: "
@@ -38,91 +145,136 @@ def get_trades(request: Request, sleeper_league_id: str, roster_id: str = 'all',
         f" league_history_count={len(previous_leagues)}"
     )
 
-    # Get trades from current league
-    all_trades: list = get_transactions_data.get_data(sleeper_league_id)
+    draft_index, trades_data = await asyncio.gather(
+        get_league_draft_index.aget_data(sleeper_league_id),
+        aget_trades_data(get_league_history.get_league_ids(sleeper_league_id, previous_leagues),
+                         get_completed_league_ids(league_data, previous_leagues))
+    )
+
+    return (league_data, league_users, previous_leagues, LeagueIndex.from_league(league_users, draft_index),
+            trades_data)
+
+
+def get_valued_trades(trades: list, league_index: LeagueIndex.LeagueIndex, ktc_store: KtcValueStore) -> list[json]:
+    # trades valued with the same KTC values are read from the cache
+    return valued_trades.get_data(
+        trades, league_index, ktc_store,
+        lambda missing_trades: calculate_trade_values(league_index=league_index, paginated_trades=missing_trades,
+                                                      ktc_store=ktc_store)
+    )
+
+
+async def aget_valued_trades(trades: list, league_index: LeagueIndex.LeagueIndex,
+                             ktc_store: KtcValueStore) -> list[json]:
+    return await valued_trades.aget_data(
+        trades, league_index, ktc_store,
+        lambda missing_trades: calculate_trade_values(league_index=league_index, paginated_trades=missing_trades,
+                                                      ktc_store=ktc_store)
+    )
+
+
+def get_completed_league_ids(league_data: json, previous_leagues: list) -> set:
+    # completed seasons never get new trades, their weeks are cached without expiry
+    completed_league_ids: set = {
+        previous_league['previous_league_id'] for previous_league in previous_leagues
+        if previous_league['status'] == 'complete'
+    }
+    if league_data['status'] == 'complete':
+        completed_league_ids.add(league_data['league_id'])
+    return completed_league_ids
+
 
-    # Get trades from previous leagues history
-    for previous_league in previous_leagues:
-        all_trades.extend(get_transactions_data.get_data(previous_league['previous_league_id']))
+def paginate_trades(seasons: list, roster_id: str, page: int, paginate: bool, transaction_id: str = None,
+                    cursor: str = None) -> tuple[list, dict]:
+    """
+    Page through the seasons' trades newest first, reading only the trades up to the page.
 
+    A cursor page starts right after the cursor's trade, found by its (created_at_millis, transaction_id)
+    key instead of skipping the previous pages' trades.
+    """
     # filter out trades belonging to different roster_ids
-    if roster_id != 'all':
-        all_trades: list = [trade for trade in all_trades if int(roster_id) in trade['roster_ids']]
-
-    # order newest to latest
-    all_trades.sort(key=lambda trade_t: trade_t['created_at_millis'], reverse=True)
-
-    # TODO if transactionId is specified, return the page with that tradeId
-
-    # apply pagination
-    paginated_trades = all_trades
-    total_pages = 1
-    has_next = False
-    has_previous = False
-    if paginate:
-        paginator: Paginator = Paginator(all_trades, PAGE_SIZE)
-        paginated_trades: json = paginator.get_page(page)
-        total_pages = paginator.num_pages
-        has_next = paginated_trades.has_next()
-        has_previous = paginated_trades.has_previous()
-
-    # Get all player IDs from the trades (adds) in a single query
-    player_ids: set = set()
-    for trade in paginated_trades:
-        if roster_id != 'all' and roster_id is int and int(roster_id) not in trade['roster_ids']:
-            continue
-        player_ids.update(trade['adds'].keys())
+    filter_roster_id: int | None = None if roster_id == 'all' else int(roster_id)
 
-    # Fetch all players at once, using only the necessary fields
-    players: QuerySet = (Players.objects.filter(sleeper_player_id__in=player_ids)
-                         .values('sleeper_player_id', 'player_name'))
-    player_dict: dict = {player['sleeper_player_id']: player for player in players}
+    total_trades: int = pages.count_trades(seasons, filter_roster_id)
+    page_info: dict = {
+        'page': page,
+        'total_pages': 1,
+        'total_trades': total_trades,
+        'has_next': False,
+        'has_previous': False,
+        'next_cursor': None
+    }
+    if not paginate:
+        return list(pages.iter_trades(seasons, roster_id=filter_roster_id)), page_info
+
+    total_pages: int = max(1, -(-total_trades // PAGE_SIZE))
+    after: tuple | None = None
+    if cursor is not None:
+        after = pages.decode_cursor(cursor)
+        page = (pages.count_newer(seasons, after, filter_roster_id) + 1) // PAGE_SIZE + 1
+    else:
+        # if transactionId is specified, return the page with that trade
+        trade_page: int | None = get_trade_page(seasons, transaction_id, filter_roster_id) if transaction_id else None
+        page = trade_page or get_page_number(page, total_pages)
+
+    offset: int = 0 if after is not None else (page - 1) * PAGE_SIZE
+    paginated_trades: list = list(islice(pages.iter_trades(seasons, after, filter_roster_id),
+                                         offset, offset + PAGE_SIZE + 1))
+    has_next: bool = len(paginated_trades) > PAGE_SIZE
+    paginated_trades = paginated_trades[:PAGE_SIZE]
+
+    page_info.update({
+        'page': page,
+        'total_pages': total_pages,
+        'has_next': has_next,
+        'has_previous': page > 1,
+        'next_cursor': pages.encode_cursor(paginated_trades[-1]) if has_next else None
+    })
+    return paginated_trades, page_info
 
-    # loop over trades and build response
-    trades_with_ktc_values: list = calculate_trade_values(draft_data=draft_data, league_users=league_users,
-                                            paginated_trades=paginated_trades, player_dict=player_dict,
-                                            roster_id=roster_id)
 
-    # build response
+def get_page_number(page, total_pages: int) -> int:
+    """Same as Paginator.get_page: the first page if page is not a number, the last page if out of range."""
+    try:
+        page = int(page)
+    except (TypeError, ValueError):
+        return 1
+    return page if 1 <= page <= total_pages else total_pages
+
+
+def get_trade_page(seasons: list, transaction_id: str, roster_id: int | None) -> int | None:
+    """The page of a trade found through the transaction index, None if it is not one of the seasons' trades."""
+    sort_position = index.get_sort_key(transaction_id)
+    if sort_position is None:
+        return None
+
+    sleeper_league_id, key = sort_position
+    if sleeper_league_id not in {season['sleeper_league_id'] for season in seasons}:
+        return None
+    return pages.count_newer(seasons, key, roster_id) // PAGE_SIZE + 1
+
+
+def build_trades_result(league_data: json, league_users: list[LeagueUser], previous_leagues: list, roster_id: str,
+                        page_info: dict, trades_with_ktc_values: list) -> json:
     return {
         'league_id': league_data['league_id'],
         'league_name': league_data['name'],
         'league_season': league_data['season'],
         'league_avatar': league_data['avatar'],
         'roster_id': roster_id,
-        'page': page,
+        'page': page_info['page'],
         'page_size': PAGE_SIZE,
-        'total_pages': total_pages,
-        'total_trades': len(all_trades),
-        'has_next': has_next,
-        'has_previous': has_previous,
+        'total_pages': page_info['total_pages'],
+        'total_trades': page_info['total_trades'],
+        'has_next': page_info['has_next'],
+        'has_previous': page_info['has_previous'],
+        'next_cursor': page_info['next_cursor'],
         'previous_leagues': previous_leagues,
         'league_users': LeagueUser.to_json(league_users),
         'trades': trades_with_ktc_values
     }
 
 
-def get_draft_data(sleeper_league_id: str, previous_leagues: list[json]) -> dict:
-    draft_data_dict = {}  # key = season ('2024'), value = draft_data
-    all_drafts = []
-    draft_data = get_drafts_data.get_data(sleeper_league_id)
-    all_drafts.append(draft_data)
-
-    # get previous drafts data
-    for previous_league in previous_leagues:
-        draft_response = get_drafts_data.get_data(previous_league['previous_league_id'])
-        all_drafts.append(draft_response)
-
-    # for every available season, get the draft data and draft picks for that draft
-    for draft in all_drafts:
-        draft_picks = get_draft_picks_data.get_data(draft['draft_id'])
-        draft_data_dict[draft['season']] = {}
-        draft_data_dict[draft['season']]['draft_data'] = draft_data
-        draft_data_dict[draft['season']]['draft_picks'] = draft_picks
-
-    return draft_data_dict
-
-
 # Find each roster's most valuable item in the trade
 def set_most_valuable(trade_obj):
     for roster_id in trade_obj['roster_ids']:
@@ -148,25 +300,19 @@ def set_most_valuable(trade_obj):
 
 # Iterate over a list of trades and calculate values
 def calculate_trade_values(
-        draft_data,
-        league_users: list[LeagueUser],
+        league_index: LeagueIndex.LeagueIndex,
         paginated_trades,
-        player_dict: dict,
-        roster_id: str | int) -> list[json]:
+        ktc_store: KtcValueStore) -> list[json]:
     updated_trades: list = []
 
     for trade in paginated_trades:
-
-        if roster_id != 'all' and roster_id is int and int(roster_id) not in trade['roster_ids']:
-            continue
-
         trade_obj: dict = {
             'sleeper_league_id': trade['sleeper_league_id']
         }
 
         # Initialize the roster_id entry in trade_obj
         for roster_id_temp in trade['roster_ids']:
-            user: LeagueUser = LeagueUser.get_user_with_roster_id(league_users=league_users, roster_id=roster_id_temp)
+            user: LeagueUser = league_index.get_user(roster_id_temp)
             trade_obj[roster_id_temp]: json = init_roster_trade(roster_id_temp, user)
 
         # get any fab
@@ -177,10 +323,9 @@ def calculate_trade_values(
         # grab values from draft picks
         for traded_draft_pick in trade['draft_picks']:
             draft_pick_value: json = get_draft_pick_data(
-                draft_data=draft_data,
+                league_index=league_index,
                 traded_draft_pick=traded_draft_pick,
-                league_users=league_users,
-                player_dict=player_dict,
+                ktc_store=ktc_store,
                 trade_created_at=trade['created_at_yyyy_mm_dd']
             )
             trade_obj[traded_draft_pick['owner_id']]['draft_picks'].append(draft_pick_value)
@@ -191,7 +336,7 @@ def calculate_trade_values(
         for key_player_id, value_roster_id in trade['adds'].items():
             player_value_data: json = get_traded_player_data(
                 key_player_id=key_player_id,
-                player_dict=player_dict,
+                ktc_store=ktc_store,
                 trade_created_at=trade['created_at_yyyy_mm_dd']
             )
             trade_obj[value_roster_id]['players'].append(player_value_data)
@@ -219,66 +364,100 @@ def calculate_trade_values(
 
 
 # reduce values returned, grab one value per week
-def trim_ktc_values(ktc_values):
-    # convert dates from string to date
-    for ktc_value in ktc_values:
-        ktc_value['date'] = datetime.strptime(ktc_value['date'], '%Y-%m-%d')
-    data = sorted(ktc_values, key=lambda x: x['date'])
-
-    # Group entries by year-month
-    grouped_by_month = defaultdict(list)
-    for entry in data:
-        year_month = entry['date'].strftime('%Y-%m')
-        grouped_by_month[year_month].append(entry)
-
-    # Select one entry per week per month
-    trimmed_data = []
-    for year_month, entries in grouped_by_month.items():
-        weeks = defaultdict(list)
-        for entry in entries:
-            week = entry['date'].strftime('%U')
-            weeks[week].append(entry)
-
-        # Select one entry per week
-        for week_entries in weeks.values():
-            trimmed_data.append(week_entries[0])
-
-    # Convert datetime objects back to date strings
-    for entry in trimmed_data:
-        entry['date'] = entry['date'].strftime('%Y-%m-%d')
-
-    return trimmed_data
-    # Optionally, sort the final trimmed data by date
-    # return sorted(trimmed_data, key=lambda x: x['date'])
+def format_ktc_values(dates, values) -> list[json]:
+    return [
+        {'ktc_value': ktc_value, 'date': date.fromordinal(date_ordinal).isoformat()}
+        for date_ordinal, ktc_value in zip(dates, values)
+    ]
+
+
+def calculate_trade_totals(league_index: LeagueIndex.LeagueIndex, trades: list, ktc_store: KtcValueStore) -> list[json]:
+    """
+    Value trades by their per-roster totals only, without building the players' value series.
+
+    :return: per trade, its transaction_id, sleeper_league_id, created_at_pretty and roster_ids, and per
+             roster_id its total_current_value and total_value_when_traded. Totals match calculate_trade_values.
+    """
+    trade_totals: list = []
+
+    for trade in trades:
+        trade_date: date = date.fromisoformat(trade['created_at_yyyy_mm_dd'])
+        trade_total: dict = {
+            'transaction_id': trade['transaction_id'],
+            'sleeper_league_id': trade['sleeper_league_id'],
+            'created_at_pretty': trade['created_at_pretty'],
+            'roster_ids': trade['roster_ids']
+        }
+        for roster_id in trade['roster_ids']:
+            # validates the roster like init_roster_trade does, a roster without a user raises the same error
+            league_index.get_user(roster_id)
+            trade_total[roster_id] = {'total_current_value': 0, 'total_value_when_traded': 0}
+
+        values: list = [
+            (traded_draft_pick['owner_id'], get_draft_pick_values(league_index, traded_draft_pick, ktc_store, trade_date))
+            for traded_draft_pick in trade['draft_picks']
+        ] + [
+            (value_roster_id, get_player_values(ktc_store, key_player_id, trade_date))
+            for key_player_id, value_roster_id in trade['adds'].items()
+        ]
+        for roster_id, (value_when_traded, latest_value) in values:
+            trade_total[roster_id]['total_current_value'] += latest_value
+            trade_total[roster_id]['total_value_when_traded'] += value_when_traded
+
+        trade_totals.append(trade_total)
+
+    return trade_totals
+
+
+def get_player_values(ktc_store: KtcValueStore, key_player_id: str, trade_date: date) -> tuple[int, int]:
+    """(value when traded, latest value) of a traded player, as in get_traded_player_data."""
+    if ktc_store.get_player_name(int(key_player_id)) is None:
+        return 0, 0
+    return ktc_store.trade_values(int(key_player_id), trade_date) or (0, 0)
+
+
+def get_draft_pick_values(league_index: LeagueIndex.LeagueIndex, traded_draft_pick: json, ktc_store: KtcValueStore,
+                          trade_date: date) -> tuple[int, int]:
+    """(value when traded, latest value) of a traded draft pick, as in get_draft_pick_data."""
+    if league_index.has_draft(traded_draft_pick['season']):
+        _, player_id_drafted = league_index.find_drafted_player(traded_draft_pick)
+        return get_player_values(ktc_store, player_id_drafted, trade_date)
+
+    if traded_draft_pick['round'] < 5:  # rounds 1-4 have KTC values
+        value_when_traded, _, latest_value = get_future_draft_pick_values(traded_draft_pick, ktc_store, trade_date)
+        return value_when_traded, latest_value
+
+    return 0, 0
+
+
+def get_future_draft_pick_values(traded_draft_pick: json, ktc_store: KtcValueStore,
+                                 trade_date: date) -> tuple[int, date, int]:
+    """(value when traded, latest value date, latest value) of a future draft pick."""
+    draft_round: int = traded_draft_pick['round']
+    draft_pick: tuple = (int(traded_draft_pick['season']), draft_round, FUTURE_DRAFT_PICK_TIER)
+
+    value_when_traded = ktc_store.draft_pick_value_on(*draft_pick, trade_date)
+    if value_when_traded is None:
+        raise Exception(f"Unable to find draft pick '{traded_draft_pick['season']} "
+                        f"{FUTURE_DRAFT_PICK_TIER} {draft_round}'")
+    latest_date, latest_value = ktc_store.draft_pick_latest(*draft_pick)
+
+    return value_when_traded, latest_date, latest_value
 
 
 def get_traded_player_data(
         key_player_id: str,
-        player_dict: dict,
+        ktc_store: KtcValueStore,
         trade_created_at: str) -> json:
-    player: json = player_dict.get(int(key_player_id))
+    player_name: str | None = ktc_store.get_player_name(int(key_player_id))
 
     ktc_values = []
 
-    if player is None:  # player won't be in the player_dict if the player was discovered via a draft pick
-        player_instance = Players.objects.filter(sleeper_player_id=int(key_player_id)).first()
-        if player_instance:
-            player: dict = {'player_name': player_instance.player_name}
-
-    if player:
-        # get ktc values
-        ktc_values = (KtcPlayerValues.objects.filter(ktc_player_id__sleeper_player_id=key_player_id)
-                      .filter(date__gte=trade_created_at)
-                      .values('ktc_value', 'date')
-                      .order_by('-date'))
-
-        ktc_values = [
-            {**item, 'date': item['date'].strftime("%Y-%m-%d")}
-            for item in ktc_values
-        ]
-
-        # reduce values returned
-        ktc_values = trim_ktc_values(ktc_values)
+    if player_name:
+        # get weekly ktc values since the trade
+        ktc_values = format_ktc_values(
+            *ktc_store.weekly_series_since(int(key_player_id), date.fromisoformat(trade_created_at))
+        )
 
     # KTC value when traded
     value_when_traded = ktc_values[0]['ktc_value'] if ktc_values and len(ktc_values) > 0 else 0
@@ -289,7 +468,7 @@ def get_traded_player_data(
 
     return {
         'player_id': key_player_id,
-        'player_name': "Unknown Player" if player is None else player['player_name'],
+        'player_name': "Unknown Player" if player_name is None else player_name,
         'value_when_traded': value_when_traded,
         'ktc_values': ktc_values,
         'latest_value': latest_value,
@@ -298,13 +477,11 @@ def get_traded_player_data(
 
 
 def get_draft_pick_data(
-        draft_data: dict,
+        league_index: LeagueIndex.LeagueIndex,
         traded_draft_pick: json,
-        league_users: list[LeagueUser],
-        player_dict: dict,
+        ktc_store: KtcValueStore,
         trade_created_at: str) -> json:
     draft_round = traded_draft_pick['round']
-    traded_draft_pick_original_roster_id = traded_draft_pick['roster_id']  # the team this pick originally belonged to
 
     draft_pick_value_dict: dict = {
         'player_drafted': None,
@@ -318,27 +495,15 @@ def get_draft_pick_data(
     }
 
     # the draft pick has been used to draft a player
-    if traded_draft_pick['season'] in draft_data:
+    if league_index.has_draft(traded_draft_pick['season']):
 
         # get the player that was drafted with the draft pick
-        user_id: str = LeagueUser.get_user_with_roster_id(league_users, traded_draft_pick_original_roster_id).user_id
-        draft_slot: int = draft_data[traded_draft_pick['season']]['draft_data']['draft_order'][user_id]
-        draft_picks = draft_data[traded_draft_pick['season']]['draft_picks']
-
-        # Using the round and the roster_id, find what the user selected with that pick
-        draft_pick_db_result = next(
-            (draft_pick for draft_pick in draft_picks if draft_pick['draft_slot'] == draft_slot
-             and draft_round == draft_pick['round']), None)
-        if draft_pick_db_result is None:
-            raise Exception(
-                f"Unable to find draft pick for roster_id {traded_draft_pick['roster_id']} for draft_slot {draft_slot}")
-
-        player_id_drafted = draft_pick_db_result['player_id']
+        draft_slot, player_id_drafted = league_index.find_drafted_player(traded_draft_pick)
 
         # get ktc value of this player
         player_data_value: json = get_traded_player_data(
             key_player_id=player_id_drafted,
-            player_dict=player_dict,
+            ktc_store=ktc_store,
             trade_created_at=trade_created_at
         )
 
@@ -356,19 +521,14 @@ def get_draft_pick_data(
     else:
 
         if draft_round < 5:  # rounds 1-4 have KTC values
-            draft_filter = f"{traded_draft_pick['season']} Mid {traded_draft_pick['round']}"
-            draft_pick_db_result = Players.objects.filter(player_name__icontains=draft_filter).first()
-
-            if draft_pick_db_result is None:
-                raise Exception(f"Unable to find draft pick '{draft_filter}'")
-
-            # get the draft pick's value
-            draft_pick_player_value_db = KtcPlayerValues.objects.filter(
-                ktc_player_id=draft_pick_db_result.ktc_player_id).first()
+            # get the draft pick's value when traded and now
+            value_when_traded, latest_date, latest_value = get_future_draft_pick_values(
+                traded_draft_pick, ktc_store, date.fromisoformat(trade_created_at)
+            )
 
-            if draft_pick_db_result:
-                draft_pick_value_dict['latest_value'] = draft_pick_player_value_db.ktc_value
-                draft_pick_value_dict['value_when_traded'] = draft_pick_player_value_db.ktc_value
+            draft_pick_value_dict['latest_value'] = latest_value
+            draft_pick_value_dict['value_when_traded'] = value_when_traded
+            draft_pick_value_dict['value_now_as_of'] = latest_date.isoformat()
 
     return draft_pick_value_dict
 
@@ -401,24 +561,6 @@ def set_trade_winner(roster_ids, trade_obj):
             trade_obj[roster_id]['won'] = (trade_obj[roster_id]['total_current_value'] == max_value)
 
 
-def get_previous_league_ids(league_data):
-    previous_leagues: list = []
-
-    while True:
-        previous_league_id = league_data['previous_league_id']
-        if not previous_league_id or previous_league_id == "0":
-            break
-
-        league_data: json = get_league_data(previous_league_id)
-        previous_leagues.append(
-            {
-                'previous_league_id': previous_league_id,
-                'season': league_data['season']
-            }
-        )
-    return previous_leagues
-
-
 def number_with_suffix(val):
     val = int(val)
     if val == 1:
@@ -0,0 +1,273 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+
+from frontend_api.cache import codec, single_flight
+from logger_util import logger
+from sleeper_api import sleeper_api_svc
+from util import map_concurrently
+
+MISS = object()  # returned by get_cached when the key is not cached
+ENTRY_VERSION = 4  # version of the entry wrapping the cached data, part of every cache key
+
+_metrics_hooks: list = []
+
+_entry_sizes: dict = {}  # resource name -> stored entry count and sizes
+_entry_sizes_lock = threading.Lock()
+
+_refresh_executor = ThreadPoolExecutor(max_workers=settings.CACHE_REFRESH_WORKERS, thread_name_prefix='cache_refresh')
+_refreshing: set = set()  # cache keys with a background refresh queued or running
+_refreshing_lock = threading.Lock()
+
+
+def register_metrics_hook(hook) -> None:
+    """
+    Register a callable invoked as hook(resource_name, event, cache_key, **details) for every cache event.
+
+    Events are 'hit', 'empty_hit' (a cached empty result), 'stale_hit' (served past the soft ttl),
+    'miss', 'fetch', 'store' (details: size_bytes), 'refresh' and 'refresh_error'.
+    """
+    _metrics_hooks.append(hook)
+
+
+def emit(resource_name: str, event: str, cache_key: str, **details) -> None:
+    for hook in _metrics_hooks:
+        try:
+            hook(resource_name, event, cache_key, **details)
+        except Exception:
+            logger.error(f"Cache metrics hook failed for '{resource_name}' {event}", exc_info=True)
+
+
+def get_entry_sizes() -> dict:
+    """Count, average and max size in bytes of the entries stored per resource since process start."""
+    with _entry_sizes_lock:
+        return {
+            resource_name: {
+                'entries': sizes['entries'],
+                'avg_bytes': sizes['total_bytes'] // sizes['entries'],
+                'max_bytes': sizes['max_bytes']
+            }
+            for resource_name, sizes in _entry_sizes.items()
+        }
+
+
+class CachedResource:
+    """
+    A Sleeper resource read through the cache.
+
+    Entries are stored with their fetch time. Within soft_ttl they are served as is, between
+    soft_ttl and ttl they are still served while a background refresh fetches a new copy, so
+    only a cold key ever puts a Sleeper round-trip on the request path. Concurrent misses of a
+    key share one fetch. Bump version whenever the shape of the cached data changes.
+
+    Data of completed seasons never changes, it is stored as a final entry which never expires
+    and is never refreshed. Empty results are cached too, flagged empty and kept for empty_ttl.
+
+    Fetched data is trimmed to the fields the app reads before it is stored, entries are stored
+    encoded by frontend_api/cache/codec.py.
+    """
+
+    def __init__(self, name: str, fetch, afetch, ttl: int, soft_ttl: int, version: int = 1, is_final=None,
+                 empty_ttl: int = None, trim=None):
+        """
+        :param name: Cache key prefix, also the resource name passed to the metrics hooks.
+        :param fetch: Fetches the data from Sleeper, called with the get() arguments.
+        :param afetch: Async version of fetch.
+        :param ttl: Seconds an entry is kept in the cache.
+        :param soft_ttl: Seconds after which an entry is refreshed in the background.
+        :param version: Version of the cached data shape, part of the cache key.
+        :param is_final: Optional callable telling from the fetched data whether it can never change.
+        :param empty_ttl: Seconds an empty result is kept in the cache, defaults to ttl.
+        :param trim: Optional callable reducing the fetched data to the fields that are used.
+        """
+        self.name = name
+        self.fetch = fetch
+        self.afetch = afetch
+        self.ttl = ttl
+        self.soft_ttl = soft_ttl
+        self.version = version
+        self.is_final = is_final
+        self.empty_ttl = empty_ttl if empty_ttl is not None else ttl
+        self.trim = trim
+
+    def cache_key(self, *args) -> str:
+        return '_'.join([self.name, f'v{ENTRY_VERSION}.{self.version}'] + [str(arg) for arg in args])
+
+    def get(self, *args, final: bool = False):
+        """
+        Get the data, fetching it on a miss.
+
+        :param final: The caller knows the data belongs to a completed season and can never change.
+        """
+        data = self.get_cached(*args, final=final)
+        if data is MISS:
+            data = single_flight.do(
+                self.cache_key(*args), lambda: self.fetch_and_cache(*args, final=final), decode=codec.decode
+            )['data']
+        return data
+
+    async def aget(self, *args, final: bool = False):
+        data = await self.aget_cached(*args, final=final)
+        if data is MISS:
+            data = (await single_flight.ado(
+                self.cache_key(*args), lambda: self.afetch_and_cache(*args, final=final), decode=codec.decode
+            ))['data']
+        return data
+
+    def get_many(self, args_list: list[tuple], final_args: set = frozenset()) -> list:
+        """
+        Get the data of many keys with a single cache read.
+
+        Missing keys are fetched concurrently, each written as soon as it is fetched so workers
+        waiting on its single flight lock read it once the lock is released.
+
+        :param args_list: The get() arguments of every key.
+        :param final_args: The arguments whose data the caller knows can never change.
+        :return: The data of every key, in args_list order.
+        """
+        cache_keys: list = [self.cache_key(*args) for args in args_list]
+        entries: dict = {cache_key: codec.decode(entry) for cache_key, entry in cache.get_many(cache_keys).items()}
+        results: list = [
+            self.read_entry(entries.get(cache_key), args, final=args in final_args)
+            for cache_key, args in zip(cache_keys, args_list)
+        ]
+
+        missing: list = [index for index, data in enumerate(results) if data is MISS]
+        if missing:
+            fetched_entries: list = map_concurrently(
+                lambda index: single_flight.do(
+                    cache_keys[index],
+                    lambda: self.fetch_and_cache(*args_list[index], final=args_list[index] in final_args),
+                    decode=codec.decode
+                ),
+                missing,
+                max_workers=settings.SLEEPER_API_MAX_CONCURRENCY
+            )
+            for index, entry in zip(missing, fetched_entries):
+                results[index] = entry['data']
+
+        return results
+
+    async def aget_many(self, args_list: list[tuple], final_args: set = frozenset()) -> list:
+        cache_keys: list = [self.cache_key(*args) for args in args_list]
+        entries: dict = {
+            cache_key: codec.decode(entry) for cache_key, entry in (await cache.aget_many(cache_keys)).items()
+        }
+        results: list = [
+            self.read_entry(entries.get(cache_key), args, final=args in final_args)
+            for cache_key, args in zip(cache_keys, args_list)
+        ]
+
+        missing: list = [index for index, data in enumerate(results) if data is MISS]
+        if missing:
+            semaphore = asyncio.Semaphore(settings.SLEEPER_API_MAX_CONCURRENCY)
+
+            async def afetch_missing(index: int) -> dict:
+                async with semaphore:
+                    return await single_flight.ado(
+                        cache_keys[index],
+                        lambda: self.afetch_and_cache(*args_list[index], final=args_list[index] in final_args),
+                        decode=codec.decode
+                    )
+
+            fetched_entries: list = await asyncio.gather(*[afetch_missing(index) for index in missing])
+            for index, entry in zip(missing, fetched_entries):
+                results[index] = entry['data']
+
+        return results
+
+    def get_cached(self, *args, final: bool = False):
+        """Get the cached data without fetching on a miss, returns MISS when not cached."""
+        entry = cache.get(self.cache_key(*args))
+        return self.read_entry(None if entry is None else codec.decode(entry), args, final)
+
+    async def aget_cached(self, *args, final: bool = False):
+        entry = await cache.aget(self.cache_key(*args))
+        return self.read_entry(None if entry is None else codec.decode(entry), args, final)
+
+    def fetch_entry(self, *args, final: bool = False) -> dict:
+        emit(self.name, 'fetch', self.cache_key(*args))
+        return self.to_entry(self.fetch(*args), final)
+
+    async def afetch_entry(self, *args, final: bool = False) -> dict:
+        emit(self.name, 'fetch', self.cache_key(*args))
+        return self.to_entry(await self.afetch(*args), final)
+
+    def fetch_and_cache(self, *args, final: bool = False) -> dict:
+        cache_key = self.cache_key(*args)
+        entry = self.fetch_entry(*args, final=final)
+        cache.set(cache_key, self.encode_entries({cache_key: entry})[cache_key], timeout=self.get_timeout(entry))
+        return entry
+
+    async def afetch_and_cache(self, *args, final: bool = False) -> dict:
+        cache_key = self.cache_key(*args)
+        entry = await self.afetch_entry(*args, final=final)
+        await cache.aset(cache_key, self.encode_entries({cache_key: entry})[cache_key], timeout=self.get_timeout(entry))
+        return entry
+
+    def encode_entries(self, entries: dict) -> dict:
+        encoded_entries: dict = {}
+        for cache_key, entry in entries.items():
+            encoded_entries[cache_key] = codec.encode(entry)
+            size_bytes = len(encoded_entries[cache_key])
+            emit(self.name, 'store', cache_key, size_bytes=size_bytes)
+            with _entry_sizes_lock:
+                sizes = _entry_sizes.setdefault(self.name, {'entries': 0, 'total_bytes': 0, 'max_bytes': 0})
+                sizes['entries'] += 1
+                sizes['total_bytes'] += size_bytes
+                sizes['max_bytes'] = max(sizes['max_bytes'], size_bytes)
+        return encoded_entries
+
+    def read_entry(self, entry, args: tuple, final: bool = False):
+        """
+        :param final: The caller knows the data can never change, a stale entry cached before the
+                      season completed is refreshed as a final entry.
+        """
+        cache_key = self.cache_key(*args)
+        if entry is None:
+            emit(self.name, 'miss', cache_key)
+            return MISS
+
+        if not entry['final'] and time.time() - entry['fetched_at'] > self.soft_ttl:
+            emit(self.name, 'stale_hit', cache_key)
+            self.refresh_in_background(args, final)
+        else:
+            emit(self.name, 'empty_hit' if entry['empty'] else 'hit', cache_key)
+        return entry['data']
+
+    def to_entry(self, data, final: bool) -> dict:
+        final = final or (self.is_final is not None and self.is_final(data))
+        if self.trim is not None and data:
+            data = self.trim(data)
+        return {'data': data, 'fetched_at': time.time(), 'final': final, 'empty': not data}
+
+    def get_timeout(self, entry: dict) -> int | None:
+        if entry['final']:
+            return None  # final entries never expire
+        return self.empty_ttl if entry['empty'] else self.ttl
+
+    def refresh_in_background(self, args: tuple, final: bool = False) -> None:
+        cache_key = self.cache_key(*args)
+        with _refreshing_lock:
+            if cache_key in _refreshing:
+                return
+            _refreshing.add(cache_key)
+        _refresh_executor.submit(self.refresh, args, final)
+
+    def refresh(self, args: tuple, final: bool = False) -> None:
+        cache_key = self.cache_key(*args)
+        try:
+            with sleeper_api_svc.background_priority():
+                single_flight.do(cache_key, lambda: self.fetch_and_cache(*args, final=final), decode=codec.decode)
+            emit(self.name, 'refresh', cache_key)
+        except Exception:
+            # keep serving the stale entry, the next stale hit retries the refresh
+            emit(self.name, 'refresh_error', cache_key)
+            logger.warning(f"Background refresh of '{cache_key}' failed", exc_info=True)
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(cache_key)
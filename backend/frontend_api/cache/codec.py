@@ -0,0 +1,45 @@
+import pickle
+import zlib
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, entries are pickled without it
+    msgpack = None
+
+FORMAT_PICKLE = 1
+FORMAT_MSGPACK = 2
+COMPRESSED = 0x80  # flag bit of the header byte
+
+COMPRESS_MIN_BYTES = 1024  # smaller payloads are not worth compressing
+COMPRESS_LEVEL = 1  # fastest, Sleeper json compresses well even at the lowest level
+
+
+def encode(value) -> bytes:
+    """
+    Serialize a cache entry to bytes: one header byte followed by the payload.
+
+    msgpack is used when installed, payloads of COMPRESS_MIN_BYTES or more are zlib compressed.
+    """
+    if msgpack is not None:
+        payload_format = FORMAT_MSGPACK
+        payload = msgpack.packb(value, use_bin_type=True)
+    else:
+        payload_format = FORMAT_PICKLE
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    if len(payload) >= COMPRESS_MIN_BYTES:
+        payload_format |= COMPRESSED
+        payload = zlib.compress(payload, COMPRESS_LEVEL)
+
+    return bytes([payload_format]) + payload
+
+
+def decode(encoded: bytes):
+    header = encoded[0]
+    payload = encoded[1:]
+    if header & COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    if header & ~COMPRESSED == FORMAT_MSGPACK:
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    return pickle.loads(payload)
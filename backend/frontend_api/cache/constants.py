@@ -4,5 +4,30 @@ CACHE_DURATION = 60 * 15
 LEAGUE_DATA_CACHE_KEY = "league_data"
 LEAGUE_DRAFT_CACHE_KEY = "league_draft_data"
 LEAGUE_DRAFT_PICKS_CACHE_KEY = "league_draft_picks_data"
+LEAGUE_DRAFT_INDEX_CACHE_KEY = "league_draft_index"
 LEAGUE_USERS_CACHE_KEY = "league_users_data"
 LEAGUE_TRANSACTIONS_CACHE_KEY = "league_transactions_data"
+LEAGUE_HISTORY_CACHE_KEY = "league_history_data"
+VALUED_TRADES_CACHE_KEY = "valued_trade"
+LEADERBOARD_STATE_CACHE_KEY = "leaderboard_state"
+TRANSACTION_INDEX_CACHE_KEY = "transaction_index"
+
+# per resource ttls in seconds, entries older than the soft ttl are served while refreshed in the background
+LEAGUE_DATA_TTL = 60 * 60 * 24
+LEAGUE_DATA_SOFT_TTL = CACHE_DURATION
+LEAGUE_DRAFT_TTL = 60 * 60 * 24
+LEAGUE_DRAFT_SOFT_TTL = 60 * 60
+LEAGUE_DRAFT_PICKS_TTL = 60 * 60 * 24
+LEAGUE_DRAFT_PICKS_SOFT_TTL = 60 * 60
+LEAGUE_DRAFT_INDEX_TTL = 60 * 60 * 24
+LEAGUE_DRAFT_INDEX_SOFT_TTL = 60 * 60
+LEAGUE_USERS_TTL = 60 * 60 * 24
+LEAGUE_USERS_SOFT_TTL = CACHE_DURATION
+LEAGUE_TRANSACTIONS_TTL = 60 * 60 * 24
+LEAGUE_TRANSACTIONS_SOFT_TTL = CACHE_DURATION
+LEAGUE_TRANSACTIONS_EMPTY_TTL = 60 * 60  # weeks without trades
+LEAGUE_HISTORY_TTL = 60 * 60 * 24
+LEAGUE_HISTORY_SOFT_TTL = CACHE_DURATION
+VALUED_TRADES_TTL = 60 * 60 * 24 * 2  # keys change with every KTC ingestion, old valuations just expire
+LEADERBOARD_STATE_TTL = 60 * 60 * 24 * 7  # updated in place on every leaderboard request
+TRANSACTION_INDEX_TTL = 60 * 60 * 24  # only trades of leagues not synced yet are indexed in the cache
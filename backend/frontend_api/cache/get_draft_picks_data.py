@@ -1,20 +1,59 @@
-from django.core.cache import cache
-
-from frontend_api.cache.constants import CACHE_DURATION, LEAGUE_DRAFT_PICKS_CACHE_KEY
+from frontend_api.cache.cached_resource import CachedResource
+from frontend_api.cache.constants import LEAGUE_DRAFT_PICKS_CACHE_KEY, LEAGUE_DRAFT_PICKS_TTL, \
+    LEAGUE_DRAFT_PICKS_SOFT_TTL
 from sleeper_api import sleeper_api_svc
 
+DRAFT_PICK_FIELDS = ('round', 'draft_slot', 'player_id')
+
 
-def fetch_and_cache_draft_picks_data(draft_id, cache_key):
+def fetch_draft_picks_data(draft_id):
     draft_picks_data = sleeper_api_svc.get_draft_picks(draft_id)
     if not draft_picks_data:
         raise Exception(f"No draft picks data found for sleeper_league_id {draft_id}")
-    cache.set(cache_key, draft_picks_data, timeout=CACHE_DURATION)
     return draft_picks_data
 
 
-def get_data(draft_id):
-    draft_cache_key = f'{LEAGUE_DRAFT_PICKS_CACHE_KEY}_{draft_id}'
-    draft_data = cache.get(draft_cache_key)
-    if not draft_data:
-        draft_data = fetch_and_cache_draft_picks_data(draft_id, draft_cache_key)
-    return draft_data
+async def afetch_draft_picks_data(draft_id):
+    draft_picks_data = await sleeper_api_svc.aget_draft_picks(draft_id)
+    if not draft_picks_data:
+        raise Exception(f"No draft picks data found for sleeper_league_id {draft_id}")
+    return draft_picks_data
+
+
+draft_picks_resource = CachedResource(
+    name=LEAGUE_DRAFT_PICKS_CACHE_KEY,
+    fetch=fetch_draft_picks_data,
+    afetch=afetch_draft_picks_data,
+    ttl=LEAGUE_DRAFT_PICKS_TTL,
+    soft_ttl=LEAGUE_DRAFT_PICKS_SOFT_TTL,
+    version=2,
+    trim=lambda draft_picks_data: [
+        {field: draft_pick.get(field) for field in DRAFT_PICK_FIELDS} for draft_pick in draft_picks_data
+    ]
+)
+
+
+def get_data(draft_id, draft_complete: bool = False):
+    return draft_picks_resource.get(draft_id, final=draft_complete)
+
+
+async def aget_data(draft_id, draft_complete: bool = False):
+    return await draft_picks_resource.aget(draft_id, final=draft_complete)
+
+
+def get_data_for_drafts(drafts: list) -> list:
+    """
+    Get the picks of every given draft with a single cache read, missing picks are fetched concurrently.
+    Picks of completed drafts are cached without expiry.
+    """
+    return draft_picks_resource.get_many(
+        [(draft['draft_id'],) for draft in drafts],
+        {(draft['draft_id'],) for draft in drafts if draft['status'] == 'complete'}
+    )
+
+
+async def aget_data_for_drafts(drafts: list) -> list:
+    return await draft_picks_resource.aget_many(
+        [(draft['draft_id'],) for draft in drafts],
+        {(draft['draft_id'],) for draft in drafts if draft['status'] == 'complete'}
+    )
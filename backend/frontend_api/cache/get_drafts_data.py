@@ -1,34 +1,52 @@
-from django.core.cache import cache
-from frontend_api.cache.constants import CACHE_DURATION, LEAGUE_DRAFT_CACHE_KEY
+from frontend_api.cache.cached_resource import CachedResource
+from frontend_api.cache.constants import LEAGUE_DRAFT_CACHE_KEY, LEAGUE_DRAFT_TTL, LEAGUE_DRAFT_SOFT_TTL
 from sleeper_api import sleeper_api_svc
 
-def fetch_and_cache_draft_data(sleeper_league_id, cache_key):
+DRAFT_FIELDS = ('draft_id', 'season', 'draft_order', 'status')
+
+
+def fetch_draft_data(sleeper_league_id):
     league_data = sleeper_api_svc.get_drafts(sleeper_league_id)
     if not league_data:
         raise Exception(f"No get_draft found for sleeper_league_id {sleeper_league_id}")
-    cache.set(cache_key, league_data, timeout=CACHE_DURATION)
     return league_data
 
 
+async def afetch_draft_data(sleeper_league_id):
+    league_data = await sleeper_api_svc.aget_drafts(sleeper_league_id)
+    if not league_data:
+        raise Exception(f"No get_draft found for sleeper_league_id {sleeper_league_id}")
+    return league_data
+
+
+drafts_resource = CachedResource(
+    name=LEAGUE_DRAFT_CACHE_KEY,
+    fetch=fetch_draft_data,
+    afetch=afetch_draft_data,
+    ttl=LEAGUE_DRAFT_TTL,
+    soft_ttl=LEAGUE_DRAFT_SOFT_TTL,
+    version=2,
+    is_final=lambda drafts_data: drafts_data[0]['status'] == 'complete',
+    trim=lambda drafts_data: [{field: draft.get(field) for field in DRAFT_FIELDS} for draft in drafts_data]
+)
+
+
 def get_data(sleeper_league_id):
-    draft_cache_key = f'{LEAGUE_DRAFT_CACHE_KEY}_{sleeper_league_id}'
-    draft_data = cache.get(draft_cache_key)
-    if not draft_data:
-        draft_data = fetch_and_cache_draft_data(sleeper_league_id, draft_cache_key)
-
-    draft_data = draft_data[0]
-
-    del draft_data['settings']
-    del draft_data['season_type']
-    del draft_data['start_time']
-    del draft_data['type']
-    del draft_data['status']
-    del draft_data['metadata']
-    del draft_data['last_message_id']
-    del draft_data['last_message_time']
-    del draft_data['last_picked']
-    del draft_data['created']
-    del draft_data['creators']
-    del draft_data['sport']
-
-    return draft_data
+    return drafts_resource.get(sleeper_league_id)[0]
+
+
+async def aget_data(sleeper_league_id):
+    return (await drafts_resource.aget(sleeper_league_id))[0]
+
+
+def get_data_for_leagues(sleeper_league_ids: list[str]) -> list:
+    """Get the draft of every given league with a single cache read, missing drafts are fetched concurrently."""
+    drafts_data: list = drafts_resource.get_many([(sleeper_league_id,) for sleeper_league_id in sleeper_league_ids])
+    return [drafts[0] for drafts in drafts_data]
+
+
+async def aget_data_for_leagues(sleeper_league_ids: list[str]) -> list:
+    drafts_data: list = await drafts_resource.aget_many(
+        [(sleeper_league_id,) for sleeper_league_id in sleeper_league_ids]
+    )
+    return [drafts[0] for drafts in drafts_data]
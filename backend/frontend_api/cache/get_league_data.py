@@ -1,20 +1,41 @@
 import json
 
-from django.core.cache import cache
-from frontend_api.cache.constants import CACHE_DURATION, LEAGUE_DATA_CACHE_KEY
+from frontend_api.cache.cached_resource import CachedResource
+from frontend_api.cache.constants import LEAGUE_DATA_CACHE_KEY, LEAGUE_DATA_TTL, LEAGUE_DATA_SOFT_TTL
 from sleeper_api import sleeper_api_svc
 
-def fetch_and_cache_league_data(sleeper_league_id: str, cache_key: str) -> json:
+LEAGUE_DATA_FIELDS = ('league_id', 'name', 'season', 'avatar', 'previous_league_id', 'status')
+
+
+def fetch_league_data(sleeper_league_id: str) -> json:
     league_data = sleeper_api_svc.get_league(sleeper_league_id)
     if not league_data:
         raise Exception(f"No data found for sleeper_league_id {sleeper_league_id}")
-    cache.set(cache_key, league_data, timeout=CACHE_DURATION)
     return league_data
 
 
-def get_league_data(sleeper_league_id: str) -> json:
-    league_cache_key = f'{LEAGUE_DATA_CACHE_KEY}_{sleeper_league_id}'
-    league_data = cache.get(league_cache_key)
+async def afetch_league_data(sleeper_league_id: str) -> json:
+    league_data = await sleeper_api_svc.aget_league(sleeper_league_id)
     if not league_data:
-        league_data = fetch_and_cache_league_data(sleeper_league_id, league_cache_key)
+        raise Exception(f"No data found for sleeper_league_id {sleeper_league_id}")
     return league_data
+
+
+league_data_resource = CachedResource(
+    name=LEAGUE_DATA_CACHE_KEY,
+    fetch=fetch_league_data,
+    afetch=afetch_league_data,
+    ttl=LEAGUE_DATA_TTL,
+    soft_ttl=LEAGUE_DATA_SOFT_TTL,
+    version=2,
+    is_final=lambda league_data: league_data['status'] == 'complete',
+    trim=lambda league_data: {field: league_data.get(field) for field in LEAGUE_DATA_FIELDS}
+)
+
+
+def get_league_data(sleeper_league_id: str) -> json:
+    return league_data_resource.get(sleeper_league_id)
+
+
+async def aget_league_data(sleeper_league_id: str) -> json:
+    return await league_data_resource.aget(sleeper_league_id)
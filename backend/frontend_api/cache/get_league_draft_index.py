@@ -0,0 +1,62 @@
+import json
+
+from frontend_api.cache import get_drafts_data, get_draft_picks_data, get_league_history
+from frontend_api.cache.cached_resource import CachedResource
+from frontend_api.cache.constants import LEAGUE_DRAFT_INDEX_CACHE_KEY, LEAGUE_DRAFT_INDEX_TTL, \
+    LEAGUE_DRAFT_INDEX_SOFT_TTL
+from frontend_api.cache.get_league_data import get_league_data, aget_league_data
+
+
+def fetch_draft_index(sleeper_league_id: str) -> json:
+    previous_leagues: list = get_league_history.get_data(get_league_data(sleeper_league_id))
+    drafts: list = get_drafts_data.get_data_for_leagues(
+        get_league_history.get_league_ids(sleeper_league_id, previous_leagues)
+    )
+    return to_draft_index(drafts, get_draft_picks_data.get_data_for_drafts(drafts))
+
+
+async def afetch_draft_index(sleeper_league_id: str) -> json:
+    previous_leagues: list = await get_league_history.aget_data(await aget_league_data(sleeper_league_id))
+    drafts: list = await get_drafts_data.aget_data_for_leagues(
+        get_league_history.get_league_ids(sleeper_league_id, previous_leagues)
+    )
+    return to_draft_index(drafts, await get_draft_picks_data.aget_data_for_drafts(drafts))
+
+
+def to_draft_index(drafts: list, drafts_picks: list) -> json:
+    """
+    :return: {'draft_orders': season -> the season's draft_order, 'drafted_players': [season, round,
+             draft_slot, sleeper player ID] of every pick, 'complete': whether every draft is complete}
+    """
+    draft_orders: dict = {}
+    drafted_players: list = []
+    for draft, draft_picks in zip(drafts, drafts_picks):
+        draft_orders[draft['season']] = draft['draft_order']
+        drafted_players.extend(
+            [draft['season'], draft_pick['round'], draft_pick['draft_slot'], draft_pick['player_id']]
+            for draft_pick in draft_picks
+        )
+    return {
+        'draft_orders': draft_orders,
+        'drafted_players': drafted_players,
+        'complete': all(draft['status'] == 'complete' for draft in drafts)
+    }
+
+
+# the draft lookups of a league's LeagueIndex, built once from every season's draft and picks
+draft_index_resource = CachedResource(
+    name=LEAGUE_DRAFT_INDEX_CACHE_KEY,
+    fetch=fetch_draft_index,
+    afetch=afetch_draft_index,
+    ttl=LEAGUE_DRAFT_INDEX_TTL,
+    soft_ttl=LEAGUE_DRAFT_INDEX_SOFT_TTL,
+    is_final=lambda draft_index: draft_index['complete']
+)
+
+
+def get_data(sleeper_league_id: str) -> json:
+    return draft_index_resource.get(sleeper_league_id)
+
+
+async def aget_data(sleeper_league_id: str) -> json:
+    return await draft_index_resource.aget(sleeper_league_id)
@@ -0,0 +1,69 @@
+import json
+
+from frontend_api.cache.cached_resource import CachedResource
+from frontend_api.cache.constants import LEAGUE_HISTORY_CACHE_KEY, LEAGUE_HISTORY_TTL, LEAGUE_HISTORY_SOFT_TTL
+from frontend_api.cache.get_league_data import get_league_data, aget_league_data
+
+
+def is_league_id(sleeper_league_id) -> bool:
+    return bool(sleeper_league_id) and sleeper_league_id != "0"
+
+
+def get_league_ids(sleeper_league_id: str, previous_leagues: list) -> list[str]:
+    """The league's seasons, newest first."""
+    return [sleeper_league_id] + [previous_league['previous_league_id'] for previous_league in previous_leagues]
+
+
+def to_history_entry(previous_league_id: str, league_data: json) -> json:
+    return {
+        'previous_league_id': previous_league_id,
+        'season': league_data['season'],
+        'status': league_data['status']
+    }
+
+
+def fetch_league_history(previous_league_id: str) -> list[json]:
+    league_history: list = []
+    while is_league_id(previous_league_id):
+        league_data: json = get_league_data(previous_league_id)
+        league_history.append(to_history_entry(previous_league_id, league_data))
+        previous_league_id = league_data['previous_league_id']
+    return league_history
+
+
+async def afetch_league_history(previous_league_id: str) -> list[json]:
+    league_history: list = []
+    while is_league_id(previous_league_id):
+        league_data: json = await aget_league_data(previous_league_id)
+        league_history.append(to_history_entry(previous_league_id, league_data))
+        previous_league_id = league_data['previous_league_id']
+    return league_history
+
+
+# the chain of seasons before a league, newest first, never changes once every season is complete
+league_history_resource = CachedResource(
+    name=LEAGUE_HISTORY_CACHE_KEY,
+    fetch=fetch_league_history,
+    afetch=afetch_league_history,
+    ttl=LEAGUE_HISTORY_TTL,
+    soft_ttl=LEAGUE_HISTORY_SOFT_TTL,
+    is_final=lambda league_history: all(previous_league['status'] == 'complete' for previous_league in league_history)
+)
+
+
+def get_data(league_data: json) -> list[json]:
+    """
+    Get the previous seasons of a league.
+
+    :param league_data: The league's data.
+    :return: {'previous_league_id', 'season', 'status'} of every previous season, newest first.
+    """
+    if not is_league_id(league_data['previous_league_id']):
+        return []
+    return league_history_resource.get(league_data['previous_league_id'])
+
+
+async def aget_data(league_data: json) -> list[json]:
+    if not is_league_id(league_data['previous_league_id']):
+        return []
+    return await league_history_resource.aget(league_data['previous_league_id'])
@@ -1,31 +1,56 @@
+import asyncio
 import json
 
-from django.core.cache import cache
-
-from frontend_api.cache.constants import CACHE_DURATION, LEAGUE_USERS_CACHE_KEY
+from frontend_api.cache.cached_resource import CachedResource
+from frontend_api.cache.constants import LEAGUE_USERS_CACHE_KEY, LEAGUE_USERS_TTL, LEAGUE_USERS_SOFT_TTL
 from frontend_api.models import LeagueUser
 from sleeper_api import sleeper_api_svc
 
 
+def fetch_league_users(sleeper_league_id) -> list[json]:
+    league_users_json: json = sleeper_api_svc.get_users(sleeper_league_id)
+    league_rosters_json: json = sleeper_api_svc.get_rosters(sleeper_league_id)
+
+    return transform_league_users(sleeper_league_id, league_users_json, league_rosters_json)
+
+
+async def afetch_league_users(sleeper_league_id) -> list[json]:
+    league_users_json, league_rosters_json = await asyncio.gather(
+        sleeper_api_svc.aget_users(sleeper_league_id),
+        sleeper_api_svc.aget_rosters(sleeper_league_id)
+    )
+
+    return transform_league_users(sleeper_league_id, league_users_json, league_rosters_json)
+
+
+league_users_resource = CachedResource(
+    name=LEAGUE_USERS_CACHE_KEY,
+    fetch=fetch_league_users,
+    afetch=afetch_league_users,
+    ttl=LEAGUE_USERS_TTL,
+    soft_ttl=LEAGUE_USERS_SOFT_TTL
+)
+
+
 def get_data(sleeper_league_id) -> list[LeagueUser]:
-    cache_key = f"{LEAGUE_USERS_CACHE_KEY}_{sleeper_league_id}"
-    league_users_data = cache.get(cache_key)
+    league_users_data = league_users_resource.get(sleeper_league_id)
 
-    if not league_users_data:
-        league_users_data = fetch_league_users(sleeper_league_id)
-        cache.set(cache_key, league_users_data, timeout=CACHE_DURATION)
+    league_users: list = [LeagueUser.from_json(league_user) for league_user in league_users_data]
+
+    return league_users
 
-        if not league_users_data:
-            raise Exception(f"No league users data found for sleeper_league_id {sleeper_league_id}")
+
+async def aget_data(sleeper_league_id) -> list[LeagueUser]:
+    league_users_data = await league_users_resource.aget(sleeper_league_id)
 
     league_users: list = [LeagueUser.from_json(league_user) for league_user in league_users_data]
 
     return league_users
 
 
-def fetch_league_users(sleeper_league_id) -> list[json]:
-    league_users_json: json = sleeper_api_svc.get_users(sleeper_league_id)
-    league_rosters_json: json = sleeper_api_svc.get_rosters(sleeper_league_id)
+def transform_league_users(sleeper_league_id, league_users_json: json, league_rosters_json: json) -> list[json]:
+    if not league_users_json:
+        raise Exception(f"No league users data found for sleeper_league_id {sleeper_league_id}")
 
     return [
         {
@@ -1,51 +1,158 @@
 import json
-from datetime import datetime
 
-from django.core.cache import cache
+from asgiref.sync import sync_to_async
 
-from frontend_api.cache.constants import LEAGUE_TRANSACTIONS_CACHE_KEY, CACHE_DURATION
+from frontend_api.cache.cached_resource import CachedResource
+from frontend_api.cache.constants import LEAGUE_TRANSACTIONS_CACHE_KEY, LEAGUE_TRANSACTIONS_TTL, \
+    LEAGUE_TRANSACTIONS_SOFT_TTL, LEAGUE_TRANSACTIONS_EMPTY_TTL
+from frontend_api.transaction_store import index, sync
+from frontend_api.transaction_store.trades import NUMBER_OF_WEEKS, filter_trades, get_synced_leagues, \
+    get_synced_trades, partition_by_roster
 from logger_util import logger
 from sleeper_api import sleeper_api_svc
 
-NUMBER_OF_WEEKS = 21
-
-
-def transform_transaction_data(item: json, sleeper_league_id: str) -> json:
-    return {
-        'created_at_millis': item['status_updated'],
-        'sleeper_league_id': sleeper_league_id,
-        'created_at_yyyy_mm_dd': datetime.fromtimestamp(item['status_updated'] / 1000).strftime('%Y-%m-%d'),
-        'created_at_pretty': datetime.fromtimestamp(item['status_updated'] / 1000).strftime('%b %d %Y'),
-        'draft_picks': item['draft_picks'],
-        'adds': item['adds'],
-        'roster_ids': item['roster_ids'],
-        'transaction_id': item['transaction_id'],
-        'waiver_budget': item['waiver_budget'],
-        'week': item['leg']
-    }
-
-
-def get_data(sleeper_league_id: str) -> json:
-    trades_list: list = []
-
-    for week in range(NUMBER_OF_WEEKS):
-        cache_key: str = f"{LEAGUE_TRANSACTIONS_CACHE_KEY}_{sleeper_league_id}_{week}"
-        league_transactions_data: json = cache.get(cache_key)
-
-        if not league_transactions_data:
-            league_transactions_data: json = sleeper_api_svc.get_transactions(sleeper_league_id, week)  # query sleeper API
-            league_transactions_data: list = [
-                transform_transaction_data(item, sleeper_league_id)
-                for item in league_transactions_data
-                if item.get('type') == 'trade'
-                   and item.get('status') == 'complete'
-                   and item.get('adds') is not None
-            ]
-            cache.set(cache_key, league_transactions_data, timeout=CACHE_DURATION)
-
-        if not league_transactions_data:
+
+def fetch_week_data(sleeper_league_id: str, week: int) -> list:
+    league_transactions_data: json = sleeper_api_svc.get_transactions(sleeper_league_id, week)  # query sleeper API
+    trades: list = filter_trades(league_transactions_data, sleeper_league_id)
+    index.record_fetched(sleeper_league_id, trades)
+    return trades
+
+
+async def afetch_week_data(sleeper_league_id: str, week: int) -> list:
+    league_transactions_data: json = await sleeper_api_svc.aget_transactions(sleeper_league_id, week)
+    trades: list = filter_trades(league_transactions_data, sleeper_league_id)
+    await index.arecord_fetched(sleeper_league_id, trades)
+    return trades
+
+
+week_trades_resource = CachedResource(
+    name=LEAGUE_TRANSACTIONS_CACHE_KEY,
+    fetch=fetch_week_data,
+    afetch=afetch_week_data,
+    ttl=LEAGUE_TRANSACTIONS_TTL,
+    soft_ttl=LEAGUE_TRANSACTIONS_SOFT_TTL,
+    empty_ttl=LEAGUE_TRANSACTIONS_EMPTY_TTL
+)
+
+
+def get_data(sleeper_league_id: str, league_complete: bool = False) -> json:
+    return get_data_for_leagues([sleeper_league_id], {sleeper_league_id} if league_complete else set())
+
+
+def get_data_for_leagues(sleeper_league_ids: list[str], completed_league_ids: set = frozenset()) -> json:
+    """
+    Get the trades of every week of every given league.
+
+    Leagues synced into the database are read with a single query, leagues due a sync are synced in
+    the background. Leagues never synced are read from Sleeper until their first sync completes: all
+    their weeks are read with a single cache read and the missing weeks are fetched concurrently.
+    Weeks of completed_league_ids are cached without expiry. Trades are returned in (league, week) order.
+
+    :param sleeper_league_ids: The league's seasons, newest first.
+    """
+    synced_trades, leagues_to_sync = get_synced_trades(sleeper_league_ids)
+    sync.schedule_sync(leagues_to_sync)
+
+    weeks: list = get_unsynced_weeks(sleeper_league_ids, synced_trades)
+    final_weeks: set = {week for week in weeks if week[0] in completed_league_ids}
+    weeks_data: list = week_trades_resource.get_many(weeks, final_weeks) if weeks else []
+
+    return merge_trades(sleeper_league_ids, synced_trades, weeks, weeks_data)
+
+
+async def aget_data_for_leagues(sleeper_league_ids: list[str], completed_league_ids: set = frozenset()) -> json:
+    """
+    Async version of get_data_for_leagues.
+    """
+    synced_trades, leagues_to_sync = await sync_to_async(get_synced_trades)(sleeper_league_ids)
+    sync.schedule_sync(leagues_to_sync)
+
+    weeks: list = get_unsynced_weeks(sleeper_league_ids, synced_trades)
+    final_weeks: set = {week for week in weeks if week[0] in completed_league_ids}
+    weeks_data: list = await week_trades_resource.aget_many(weeks, final_weeks) if weeks else []
+
+    return merge_trades(sleeper_league_ids, synced_trades, weeks, weeks_data)
+
+
+def get_seasons(sleeper_league_ids: list[str], completed_league_ids: set = frozenset()) -> list[json]:
+    """
+    Get every given league season with its trade count, to page through the seasons' trades without
+    reading them all.
+
+    Synced seasons are only counted, their trades are read page by page from the database. Seasons not
+    synced yet are read from Sleeper as in get_data_for_leagues.
+
+    :param sleeper_league_ids: The league's seasons, newest first.
+    :return: per season {'sleeper_league_id', 'trade_count', 'roster_trade_counts': roster_id -> trade count,
+             'trades' and 'roster_trades' (roster_id -> trades): None for synced seasons}
+    """
+    trade_counts, leagues_to_sync = get_synced_leagues(sleeper_league_ids)
+    sync.schedule_sync(leagues_to_sync)
+
+    weeks: list = get_unsynced_weeks(sleeper_league_ids, trade_counts)
+    final_weeks: set = {week for week in weeks if week[0] in completed_league_ids}
+    weeks_data: list = week_trades_resource.get_many(weeks, final_weeks) if weeks else []
+
+    return to_seasons(sleeper_league_ids, trade_counts, weeks, weeks_data)
+
+
+async def aget_seasons(sleeper_league_ids: list[str], completed_league_ids: set = frozenset()) -> list[json]:
+    trade_counts, leagues_to_sync = await sync_to_async(get_synced_leagues)(sleeper_league_ids)
+    sync.schedule_sync(leagues_to_sync)
+
+    weeks: list = get_unsynced_weeks(sleeper_league_ids, trade_counts)
+    final_weeks: set = {week for week in weeks if week[0] in completed_league_ids}
+    weeks_data: list = await week_trades_resource.aget_many(weeks, final_weeks) if weeks else []
+
+    return to_seasons(sleeper_league_ids, trade_counts, weeks, weeks_data)
+
+
+def to_seasons(sleeper_league_ids: list[str], trade_counts: dict, weeks: list, weeks_data: list) -> list[json]:
+    trades_by_league_id: dict = {sleeper_league_id: [] for sleeper_league_id in sleeper_league_ids}
+    for (sleeper_league_id, _), week_data in zip(weeks, weeks_data):
+        trades_by_league_id[sleeper_league_id].extend(week_data)
+
+    seasons: list = []
+    for sleeper_league_id in sleeper_league_ids:
+        if sleeper_league_id in trade_counts:
+            seasons.append({
+                'sleeper_league_id': sleeper_league_id,
+                **trade_counts[sleeper_league_id],
+                'trades': None,
+                'roster_trades': None
+            })
             continue
-        trades_list.extend(league_transactions_data)
 
-    logger.debug(f"Found {len(trades_list)} trades for league ID {sleeper_league_id}")
+        trades: list = trades_by_league_id[sleeper_league_id]
+        roster_trades: dict = partition_by_roster(trades)
+        seasons.append({
+            'sleeper_league_id': sleeper_league_id,
+            'trade_count': len(trades),
+            'roster_trade_counts': {roster_id: len(trades) for roster_id, trades in roster_trades.items()},
+            'trades': trades,
+            'roster_trades': roster_trades
+        })
+
+    return seasons
+
+
+def get_unsynced_weeks(sleeper_league_ids: list[str], synced_league_ids) -> list[tuple]:
+    return [
+        (sleeper_league_id, week)
+        for sleeper_league_id in sleeper_league_ids if sleeper_league_id not in synced_league_ids
+        for week in range(NUMBER_OF_WEEKS)
+    ]
+
+
+def merge_trades(sleeper_league_ids: list[str], synced_trades: dict, weeks: list, weeks_data: list) -> list:
+    trades_by_league_id: dict = dict(synced_trades)
+    for (sleeper_league_id, _), week_data in zip(weeks, weeks_data):
+        trades_by_league_id.setdefault(sleeper_league_id, []).extend(week_data)
+
+    trades_list: list = [
+        trade for sleeper_league_id in sleeper_league_ids for trade in trades_by_league_id.get(sleeper_league_id, [])
+    ]
+
+    logger.debug(f"Found {len(trades_list)} trades for league IDs {sleeper_league_ids}")
     return trades_list
@@ -0,0 +1,254 @@
+import json
+from bisect import bisect_left, bisect_right
+
+from django.core.cache import cache
+
+from frontend_api.cache import codec
+from frontend_api.cache.cached_resource import emit
+from frontend_api.cache.constants import LEADERBOARD_STATE_CACHE_KEY, LEADERBOARD_STATE_TTL
+from frontend_api.ktc_store.value_store import KtcValueStore
+from frontend_api.models.LeagueIndex import LeagueIndex
+
+VERSION = 1  # bump when the state's shape changes
+
+MAX_WORST_TRADE_NET = float('inf')  # worst trade net of a roster without trades
+MIN_BEST_TRADE_NET = 0  # a trade is only a roster's best trade when its net is above this
+
+
+def cache_key(sleeper_league_id: str) -> str:
+    return f"{LEADERBOARD_STATE_CACHE_KEY}_v{VERSION}_{sleeper_league_id}"
+
+
+def get_data(sleeper_league_id: str, seasons: dict, league_index: LeagueIndex, all_trades: list,
+             ktc_store: KtcValueStore, value_trades) -> json:
+    """
+    Get a league's leaderboard state, updated for new trades and new KTC values.
+
+    The state keeps every two-roster trade's totals along with, per roster, the nets of its trades in date
+    order with their running sum, sparse tables for best and worst trade lookups over any date window,
+    and per-season aggregates. Only trades not in the state yet are valued, unless the KTC values or the
+    league's users or drafts changed since it was stored, then every trade is valued again. Trades no
+    longer in all_trades, reversed on Sleeper, are dropped and the state is rebuilt without them.
+
+    :param sleeper_league_id: The current season's league ID.
+    :param seasons: league ID -> season of every league in the league's history.
+    :param league_index: The league's LeagueIndex.
+    :param all_trades: Every trade in the league's history.
+    :param ktc_store: The KTC value store the trades are valued with.
+    :param value_trades: Callable returning the totals of a list of trades (calculate_trade_totals).
+    """
+    key: str = cache_key(sleeper_league_id)
+    encoded = cache.get(key)
+    state: json = None if encoded is None else codec.decode(encoded)
+    emit(LEADERBOARD_STATE_CACHE_KEY, 'miss' if state is None else 'hit', key)
+
+    state, changed = update_state(state, seasons, league_index, all_trades, ktc_store, value_trades)
+    if changed:
+        emit(LEADERBOARD_STATE_CACHE_KEY, 'store', key)
+        cache.set(key, codec.encode(state), timeout=LEADERBOARD_STATE_TTL)
+
+    return state
+
+
+async def aget_data(sleeper_league_id: str, seasons: dict, league_index: LeagueIndex, all_trades: list,
+                    ktc_store: KtcValueStore, value_trades) -> json:
+    key: str = cache_key(sleeper_league_id)
+    encoded = await cache.aget(key)
+    state: json = None if encoded is None else codec.decode(encoded)
+    emit(LEADERBOARD_STATE_CACHE_KEY, 'miss' if state is None else 'hit', key)
+
+    state, changed = update_state(state, seasons, league_index, all_trades, ktc_store, value_trades)
+    if changed:
+        emit(LEADERBOARD_STATE_CACHE_KEY, 'store', key)
+        await cache.aset(key, codec.encode(state), timeout=LEADERBOARD_STATE_TTL)
+
+    return state
+
+
+def update_state(state: json, seasons: dict, league_index: LeagueIndex, all_trades: list,
+                 ktc_store: KtcValueStore, value_trades) -> tuple[json, bool]:
+    """
+    :param state: The stored state, None if there is none.
+    :return: (the updated state, whether it changed)
+    """
+    all_trades = [trade for trade in all_trades if len(trade['roster_ids']) == 2]
+
+    if (state is None or state['ktc_version'] != ktc_store.version
+            or state['fingerprint'] != league_index.fingerprint()):
+        trade_totals: dict = {}
+    else:
+        trade_totals: dict = state['trades']
+
+    # trades reversed on Sleeper are no longer in all_trades, they are dropped from the state
+    transaction_ids: set = {trade['transaction_id'] for trade in all_trades}
+    removed_transaction_ids: list = [transaction_id for transaction_id in trade_totals if transaction_id not in transaction_ids]
+
+    new_trades: list = [trade for trade in all_trades if trade['transaction_id'] not in trade_totals]
+    if state is not None and not new_trades and not removed_transaction_ids:
+        return state, False
+
+    trade_totals = {
+        transaction_id: trade_total for transaction_id, trade_total in trade_totals.items()
+        if transaction_id in transaction_ids
+    }
+    for trade, trade_total in zip(new_trades, value_trades(new_trades) if new_trades else []):
+        trade_total['season'] = seasons.get(trade['sleeper_league_id'])
+        trade_total['created_at_yyyy_mm_dd'] = trade['created_at_yyyy_mm_dd']
+        trade_total['created_at_millis'] = trade['created_at_millis']
+        trade_totals[trade['transaction_id']] = trade_total
+
+    return build_state(trade_totals, ktc_store.version, league_index.fingerprint()), True
+
+
+def build_state(trade_totals: dict, ktc_version: int, fingerprint: str) -> json:
+    # oldest first, so running sums and windows follow trade dates
+    ordered_trades: list = sorted(trade_totals.values(), key=lambda trade_total: trade_total['created_at_millis'])
+
+    rosters: dict = {}
+    seasons: dict = {}
+    for trade_total in ordered_trades:
+        roster_id_1, roster_id_2 = trade_total['roster_ids']
+        for roster_id, other_roster_id in ((roster_id_1, roster_id_2), (roster_id_2, roster_id_1)):
+            net_value = (trade_total[roster_id]['total_current_value']
+                         - trade_total[other_roster_id]['total_current_value'])
+
+            roster: dict = rosters.setdefault(roster_id, {'dates': [], 'nets': [], 'transaction_ids': []})
+            roster['dates'].append(trade_total['created_at_yyyy_mm_dd'])
+            roster['nets'].append(net_value)
+            roster['transaction_ids'].append(trade_total['transaction_id'])
+
+            season_ranking: dict = seasons.setdefault(trade_total['season'], {}).setdefault(roster_id, {
+                'total_net_value': 0, 'total_trades': 0, 'best': None, 'worst': None
+            })
+            season_ranking['total_net_value'] += net_value
+            season_ranking['total_trades'] += 1
+            if season_ranking['best'] is None or is_better(season_ranking['best'][0], net_value):
+                season_ranking['best'] = (net_value, trade_total['transaction_id'])
+            if season_ranking['worst'] is None or is_worse(season_ranking['worst'][0], net_value):
+                season_ranking['worst'] = (net_value, trade_total['transaction_id'])
+
+    for roster in rosters.values():
+        roster['cumulative_nets'] = [0]
+        for net_value in roster['nets']:
+            roster['cumulative_nets'].append(roster['cumulative_nets'][-1] + net_value)
+        roster['best_table'] = build_sparse_table(roster['nets'], is_better)
+        roster['worst_table'] = build_sparse_table(roster['nets'], is_worse)
+
+    return {
+        'ktc_version': ktc_version,
+        'fingerprint': fingerprint,
+        'trades': trade_totals,
+        'rosters': rosters,
+        'seasons': seasons
+    }
+
+
+def is_better(earlier_net, later_net) -> bool:
+    return later_net >= earlier_net  # ties go to the newest trade
+
+
+def is_worse(earlier_net, later_net) -> bool:
+    return later_net <= earlier_net
+
+
+def build_sparse_table(nets: list, prefer_later) -> list[list]:
+    """
+    Sparse table of the preferred trade index in every range of 2^level trades, answering range queries
+    with two lookups.
+
+    :param prefer_later: Called with (net of the earlier trade, net of the later trade), True if the later
+                         trade is preferred.
+    """
+    table: list = [list(range(len(nets)))]
+    width = 1
+    while width * 2 <= len(nets):
+        previous_level: list = table[-1]
+        table.append([
+            pick(nets, previous_level[index], previous_level[index + width], prefer_later)
+            for index in range(len(nets) - width * 2 + 1)
+        ])
+        width *= 2
+    return table
+
+
+def pick(nets: list, earlier_index: int, later_index: int, prefer_later) -> int:
+    return later_index if prefer_later(nets[earlier_index], nets[later_index]) else earlier_index
+
+
+def query_sparse_table(table: list, nets: list, start: int, end: int, prefer_later) -> int:
+    """The preferred trade index in nets[start:end], end > start."""
+    level = (end - start).bit_length() - 1
+    return pick(nets, table[level][start], table[level][end - (1 << level)], prefer_later)
+
+
+def get_roster_ranking(state: json, roster_id: int, season: str = None, start_date: str = None,
+                       end_date: str = None) -> dict:
+    """
+    A roster's net value, trade count, best and worst trade over a season or date window, without going
+    over its trades.
+
+    :param season: Only the trades of this season.
+    :param start_date: Only trades on or after this date ('YYYY-MM-DD').
+    :param end_date: Only trades on or before this date ('YYYY-MM-DD').
+    :return: {'total_net_value', 'total_trades', 'best': (net, transaction_id) | None, 'worst': ...}
+    """
+    empty_ranking: dict = {'total_net_value': 0, 'total_trades': 0, 'best': None, 'worst': None}
+
+    if season is not None:
+        return state['seasons'].get(season, {}).get(roster_id, empty_ranking)
+
+    roster: dict = state['rosters'].get(roster_id)
+    if roster is None:
+        return empty_ranking
+
+    start: int = 0 if start_date is None else bisect_left(roster['dates'], start_date)
+    end: int = len(roster['dates']) if end_date is None else bisect_right(roster['dates'], end_date)
+    if end <= start:
+        return empty_ranking
+
+    nets: list = roster['nets']
+    best_index = query_sparse_table(roster['best_table'], nets, start, end, is_better)
+    worst_index = query_sparse_table(roster['worst_table'], nets, start, end, is_worse)
+    return {
+        'total_net_value': roster['cumulative_nets'][end] - roster['cumulative_nets'][start],
+        'total_trades': end - start,
+        'best': (nets[best_index], roster['transaction_ids'][best_index]),
+        'worst': (nets[worst_index], roster['transaction_ids'][worst_index])
+    }
+
+
+def get_trade_reference(state: json, transaction_id: str) -> json:
+    trade_total: json = state['trades'][transaction_id]
+    return {
+        'transaction_id': transaction_id,
+        'sleeper_league_id': trade_total['sleeper_league_id'],
+        'created_at_pretty': trade_total['created_at_pretty']
+    }
+
+
+def get_rankings(state: json, league_users: list[json], season: str = None, start_date: str = None,
+                 end_date: str = None) -> list[json]:
+    """
+    Every roster's ranking over the window, highest total net value first. best_trade and worst_trade are
+    trade references.
+    """
+    rankings: dict = {}
+    for user in league_users:
+        roster_ranking: dict = get_roster_ranking(state, user['roster_id'], season, start_date, end_date)
+        best, worst = roster_ranking['best'], roster_ranking['worst']
+        if best is not None and best[0] <= MIN_BEST_TRADE_NET:
+            best = None
+
+        rankings[user['roster_id']] = {
+            "username": user['user_name'],
+            "roster_id": user['roster_id'],
+            "user_id": user['user_id'],
+            "total_net_value": roster_ranking['total_net_value'],
+            "total_trades": roster_ranking['total_trades'],
+            "worst_trade_net": MAX_WORST_TRADE_NET if worst is None else worst[0],
+            "best_trade_net": MIN_BEST_TRADE_NET if best is None else best[0],
+            "worst_trade": None if worst is None else get_trade_reference(state, worst[1]),
+            "best_trade": None if best is None else get_trade_reference(state, best[1])
+        }
+
+    return sorted(rankings.values(), key=lambda ranking: ranking['total_net_value'], reverse=True)
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.cache import cache
+
+from logger_util import logger
+
+LOCK_KEY_PREFIX = "single_flight_lock"
+LOCK_POLL_INTERVAL = 0.05  # seconds
+
+_NOT_FOUND = object()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_calls: dict = {}  # cache key -> _Call
+_calls_lock = threading.Lock()
+
+_async_calls = weakref.WeakKeyDictionary()  # event loop -> {cache key -> asyncio.Future}
+
+
+def do(cache_key: str, fetch, decode=None):
+    """
+    Run fetch once for all concurrent callers missing the same cache key.
+
+    The first caller runs fetch, callers arriving while it is in flight wait for it and share its
+    result or its exception. fetch is expected to store its result under cache_key.
+
+    :param cache_key: The cache key being filled, identifies the in-flight fetch.
+    :param fetch: Callable without arguments that fetches and caches the data.
+    :param decode: Optional callable turning the cached value into the result of fetch.
+    :return: The result of fetch.
+    """
+    with _calls_lock:
+        call = _calls.get(cache_key)
+        is_leader = call is None
+        if is_leader:
+            call = _Call()
+            _calls[cache_key] = call
+
+    if not is_leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = fetch_with_cache_lock(cache_key, fetch, decode)
+        return call.result
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            del _calls[cache_key]
+        call.done.set()
+
+
+async def ado(cache_key: str, afetch, decode=None):
+    """
+    Async version of do, afetch is a callable without arguments returning an awaitable.
+
+    When the leading task is cancelled, e.g. its client disconnected, the waiting tasks fetch
+    themselves instead of sharing the cancellation.
+    """
+    loop = asyncio.get_running_loop()
+    calls: dict = _async_calls.setdefault(loop, {})
+
+    while (future := calls.get(cache_key)) is not None:
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # this task was cancelled, not the leader
+
+    future = loop.create_future()
+    calls[cache_key] = future
+    try:
+        result = await afetch_with_cache_lock(cache_key, afetch, decode)
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # mark retrieved, the waiters (if any) re-raise it
+        raise
+    finally:
+        del calls[cache_key]
+        if not future.done():
+            future.cancel()  # cancelled or interrupted, the waiters retry
+
+
+def fetch_with_cache_lock(cache_key: str, fetch, decode=None):
+    """
+    Coordinate the fetch across worker processes with a lock entry in the shared cache.
+
+    Only used when settings.SINGLE_FLIGHT_CACHE_LOCK is enabled. fetch must have stored cache_key
+    when it returns, the lock is released right after. A process that does not get the lock waits
+    for the holder to fill cache_key. When the holder releases the lock without filling it, e.g.
+    its fetch failed, the first waiter to take the lock over fetches. A waiter fetches anyway if
+    the holder takes longer than the lock timeout.
+    """
+    if not settings.SINGLE_FLIGHT_CACHE_LOCK:
+        return fetch()
+
+    lock_key = f"{LOCK_KEY_PREFIX}_{cache_key}"
+    lock_timeout = settings.SINGLE_FLIGHT_LOCK_TIMEOUT
+    if not cache.add(lock_key, 1, timeout=lock_timeout):
+        deadline = time.monotonic() + lock_timeout
+        while True:
+            time.sleep(LOCK_POLL_INTERVAL)
+            result = cache.get(cache_key, _NOT_FOUND)
+            if result is not _NOT_FOUND:
+                return result if decode is None else decode(result)
+            if cache.add(lock_key, 1, timeout=lock_timeout):
+                break  # released without filling cache_key, take the fetch over
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting on '{lock_key}', fetching anyway")
+                return fetch()
+
+    try:
+        return fetch()
+    finally:
+        cache.delete(lock_key)
+
+
+async def afetch_with_cache_lock(cache_key: str, afetch, decode=None):
+    if not settings.SINGLE_FLIGHT_CACHE_LOCK:
+        return await afetch()
+
+    lock_key = f"{LOCK_KEY_PREFIX}_{cache_key}"
+    lock_timeout = settings.SINGLE_FLIGHT_LOCK_TIMEOUT
+    if not await cache.aadd(lock_key, 1, timeout=lock_timeout):
+        deadline = time.monotonic() + lock_timeout
+        while True:
+            await asyncio.sleep(LOCK_POLL_INTERVAL)
+            result = await cache.aget(cache_key, _NOT_FOUND)
+            if result is not _NOT_FOUND:
+                return result if decode is None else decode(result)
+            if await cache.aadd(lock_key, 1, timeout=lock_timeout):
+                break
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting on '{lock_key}', fetching anyway")
+                return await afetch()
+
+    try:
+        return await afetch()
+    finally:
+        await cache.adelete(lock_key)
@@ -0,0 +1,207 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class LocalTier:
+    """
+    In-process LRU of pickled values, bounded by the total size of the values in bytes.
+
+    Shared by every thread of the process, Django creates one cache backend instance per thread.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # key -> (expires_at, pickled value), least recently used first
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] is not None and entry[0] <= time.time():
+                self._delete(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, pickled: bytes, expires_at: float | None) -> None:
+        with self.lock:
+            self._delete(key)
+            if len(pickled) > self.max_bytes:
+                return
+            self.entries[key] = (expires_at, pickled)
+            self.total_bytes += len(pickled)
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+
+    def delete(self, key) -> None:
+        with self.lock:
+            self._delete(key)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def _delete(self, key) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[1])
+
+
+class TierStats:
+    def __init__(self):
+        self.hits = {'local': 0, 'shared': 0}
+        self.misses = {'local': 0, 'shared': 0}
+        self.lock = threading.Lock()
+
+    def record(self, tier: str, hit: bool, count: int = 1) -> None:
+        with self.lock:
+            (self.hits if hit else self.misses)[tier] += count
+
+
+_local_tiers: dict = {}
+_tier_stats: dict = {}
+_tiers_lock = threading.Lock()
+
+
+class TieredCache(BaseCache):
+    """
+    Two tier cache backend: a byte bounded in-process LRU in front of a cache shared by all workers.
+
+    Reads check the local tier first and fill it from the shared tier. Writes go to both tiers.
+    Local copies live at most LOCAL_TIMEOUT seconds, so a value written by another worker is
+    picked up within that time.
+
+    OPTIONS:
+        SHARED_CACHE: alias of the shared cache in settings.CACHES
+        LOCAL_MAX_BYTES: size limit of the local tier
+        LOCAL_TIMEOUT: seconds a value is kept in the local tier
+    """
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, name, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options['SHARED_CACHE']
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 60)
+        with _tiers_lock:
+            self.local = _local_tiers.setdefault(name, LocalTier(options.get('LOCAL_MAX_BYTES', 64 * 1024 * 1024)))
+            self.stats = _tier_stats.setdefault(name, TierStats())
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.shared_alias]
+
+    def get_stats(self) -> dict:
+        """Hits, misses and hit ratio of each tier since process start."""
+        with self.stats.lock:
+            return {
+                tier: {
+                    'hits': self.stats.hits[tier],
+                    'misses': self.stats.misses[tier],
+                    'hit_ratio': self.stats.hits[tier] / max(1, self.stats.hits[tier] + self.stats.misses[tier])
+                }
+                for tier in ('local', 'shared')
+            } | {'local_bytes': self.local.total_bytes, 'local_entries': len(self.local.entries)}
+
+    def get_local_expires_at(self, timeout) -> float | None:
+        timeout = self.local_timeout if timeout is None else min(self.local_timeout, timeout)
+        return time.time() + timeout
+
+    def set_local(self, key, value, timeout=DEFAULT_TIMEOUT) -> None:
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        self.local.set(key, pickle.dumps(value, self.pickle_protocol), self.get_local_expires_at(timeout))
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_and_validate_key(key, version=version)
+        pickled = self.local.get(local_key)
+        self.stats.record('local', pickled is not None)
+        if pickled is not None:
+            return pickle.loads(pickled)
+
+        sentinel = object()
+        value = self.shared.get(key, sentinel, version=version)
+        self.stats.record('shared', value is not sentinel)
+        if value is sentinel:
+            return default
+        self.local.set(local_key, pickle.dumps(value, self.pickle_protocol), self.get_local_expires_at(None))
+        return value
+
+    def get_many(self, keys, version=None):
+        found = {}
+        shared_keys = []
+        for key in keys:
+            pickled = self.local.get(self.make_and_validate_key(key, version=version))
+            if pickled is None:
+                shared_keys.append(key)
+            else:
+                found[key] = pickle.loads(pickled)
+        self.stats.record('local', True, len(found))
+        self.stats.record('local', False, len(shared_keys))
+
+        if shared_keys:
+            shared_found = self.shared.get_many(shared_keys, version=version)
+            self.stats.record('shared', True, len(shared_found))
+            self.stats.record('shared', False, len(shared_keys) - len(shared_found))
+            for key, value in shared_found.items():
+                local_key = self.make_and_validate_key(key, version=version)
+                self.local.set(local_key, pickle.dumps(value, self.pickle_protocol), self.get_local_expires_at(None))
+            found.update(shared_found)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout=timeout, version=version)
+        self.set_local(self.make_and_validate_key(key, version=version), value, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed_keys = self.shared.set_many(data, timeout=timeout, version=version)
+        for key, value in data.items():
+            if key not in failed_keys:
+                self.set_local(self.make_and_validate_key(key, version=version), value, timeout)
+        return failed_keys
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # only the shared tier can tell whether another worker added the key first
+        added = self.shared.add(key, value, timeout=timeout, version=version)
+        if added:
+            self.set_local(self.make_and_validate_key(key, version=version), value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.touch(key, timeout=timeout, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.incr(key, delta=delta, version=version)
+
+    def has_key(self, key, version=None):
+        if self.local.get(self.make_and_validate_key(key, version=version)) is not None:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    def delete(self, key, version=None):
+        self.local.delete(self.make_and_validate_key(key, version=version))
+        return self.shared.delete(key, version=version)
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.local.delete(self.make_and_validate_key(key, version=version))
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
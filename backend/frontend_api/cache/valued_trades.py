@@ -0,0 +1,77 @@
+import json
+
+from django.core.cache import cache
+
+from frontend_api.cache import codec
+from frontend_api.cache.cached_resource import emit
+from frontend_api.cache.constants import VALUED_TRADES_CACHE_KEY, VALUED_TRADES_TTL
+from frontend_api.ktc_store.value_store import KtcValueStore
+from frontend_api.models.LeagueIndex import LeagueIndex
+
+VERSION = 1  # bump when the valued trade's shape changes
+
+
+def cache_key(trade: json, league_index: LeagueIndex, ktc_store: KtcValueStore) -> str:
+    """
+    A valued trade only changes with new KTC values or a change to the league's users or drafts, both are
+    part of the key so new ingestions and league changes never read stale valuations.
+    """
+    return (f"{VALUED_TRADES_CACHE_KEY}_v{VERSION}_{trade['transaction_id']}_{ktc_store.version}_"
+            f"{league_index.fingerprint()}")
+
+
+def get_data(trades: list, league_index: LeagueIndex, ktc_store: KtcValueStore, value_trades) -> list[json]:
+    """
+    Get the valued trades with a single cache read, valuing and caching only the missing ones.
+
+    :param trades: The trades to value.
+    :param league_index: The league's LeagueIndex.
+    :param ktc_store: The KTC value store the trades are valued with.
+    :param value_trades: Callable valuing a list of trades, returning the valued trades in order.
+    :return: The valued trades, in trades order.
+    """
+    cache_keys: list = [cache_key(trade, league_index, ktc_store) for trade in trades]
+    cached: dict = cache.get_many(cache_keys)
+
+    missing: list = record_reads(cache_keys, cached)
+    valued_trades: list = value_trades([trades[index] for index in missing]) if missing else []
+    if valued_trades:
+        cache.set_many(encode_trades(cache_keys, missing, valued_trades), timeout=VALUED_TRADES_TTL)
+
+    return merge(cache_keys, cached, missing, valued_trades)
+
+
+async def aget_data(trades: list, league_index: LeagueIndex, ktc_store: KtcValueStore, value_trades) -> list[json]:
+    cache_keys: list = [cache_key(trade, league_index, ktc_store) for trade in trades]
+    cached: dict = await cache.aget_many(cache_keys)
+
+    missing: list = record_reads(cache_keys, cached)
+    valued_trades: list = value_trades([trades[index] for index in missing]) if missing else []
+    if valued_trades:
+        await cache.aset_many(encode_trades(cache_keys, missing, valued_trades), timeout=VALUED_TRADES_TTL)
+
+    return merge(cache_keys, cached, missing, valued_trades)
+
+
+def record_reads(cache_keys: list, cached: dict) -> list:
+    """Emit a hit or miss per key, returns the indexes of the missing keys."""
+    missing: list = []
+    for index, key in enumerate(cache_keys):
+        if key in cached:
+            emit(VALUED_TRADES_CACHE_KEY, 'hit', key)
+        else:
+            emit(VALUED_TRADES_CACHE_KEY, 'miss', key)
+            missing.append(index)
+    return missing
+
+
+def encode_trades(cache_keys: list, missing: list, valued_trades: list) -> dict:
+    return {cache_keys[index]: codec.encode(valued_trade) for index, valued_trade in zip(missing, valued_trades)}
+
+
+def merge(cache_keys: list, cached: dict, missing: list, valued_trades: list) -> list[json]:
+    valued_by_index: dict = dict(zip(missing, valued_trades))
+    return [
+        valued_by_index[index] if index in valued_by_index else codec.decode(cached[key])
+        for index, key in enumerate(cache_keys)
+    ]
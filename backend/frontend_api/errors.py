@@ -0,0 +1,2 @@
+class InvalidRequestError(ValueError):
+    """Raised for a malformed request parameter, the views answer it with a 400."""
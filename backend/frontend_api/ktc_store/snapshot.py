@@ -0,0 +1,138 @@
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from logger_util import logger
+
+MAGIC = b'KTCS'
+FORMAT_VERSION = 3
+
+# magic, format version, 1 if written little-endian, store version, player count, value count,
+# weekly value count, metadata size
+HEADER = struct.Struct('<4sHBxqIIIxxxxQ')
+INDEX_COLUMNS = 6  # sleeper player ID, ktc player ID, offset, length, weekly offset, weekly length
+
+
+def write_snapshot(store, path: str) -> None:
+    """
+    Write a store to a binary snapshot file, replacing the current file atomically.
+
+    Layout: header, offset index, every date ordinal, every value, every weekly date ordinal, every
+    weekly value, JSON metadata. Draft pick series follow the player series in the date and value
+    columns, their offsets are in the metadata. The index and
+    the arrays are int32 in native byte order so readers can map them without copying.
+
+    :param store: KtcValueStore to write.
+    :param path: Snapshot file path.
+    """
+    index = array('i')
+    dates = array('i')
+    values = array('i')
+    weekly_dates = array('i')
+    weekly_values = array('i')
+    for sleeper_player_id, (player_dates, player_values) in sorted(store.series.items()):
+        player_weekly_dates, player_weekly_values = store.weekly_series[sleeper_player_id]
+        index.extend((sleeper_player_id, store.ktc_player_ids[sleeper_player_id], len(dates), len(player_dates),
+                      len(weekly_dates), len(player_weekly_dates)))
+        dates.extend(player_dates)
+        values.extend(player_values)
+        weekly_dates.extend(player_weekly_dates)
+        weekly_values.extend(player_weekly_values)
+
+    draft_picks: list = []
+    for (season, draft_round, tier), (pick_dates, pick_values) in sorted(store.draft_pick_series.items()):
+        draft_picks.append((season, draft_round, tier, len(dates), len(pick_dates)))
+        dates.extend(pick_dates)
+        values.extend(pick_values)
+
+    metadata: bytes = json.dumps({
+        'player_names': store.player_names,
+        'draft_picks': draft_picks
+    }).encode('utf-8')
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, FORMAT_VERSION, sys.byteorder == 'little', store.version,
+                               len(index) // INDEX_COLUMNS, len(values), len(weekly_values), len(metadata)))
+        index.tofile(file)
+        dates.tofile(file)
+        values.tofile(file)
+        weekly_dates.tofile(file)
+        weekly_values.tofile(file)
+        file.write(metadata)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+    logger.info(f"Wrote KTC snapshot version={store.version} to {path}: {len(index) // INDEX_COLUMNS} players, "
+                f"{len(values)} values")
+
+
+def read_snapshot(path: str, min_version: int) -> tuple[int, dict] | None:
+    """
+    Map a snapshot file into memory.
+
+    :param path: Snapshot file path.
+    :param min_version: Oldest store version accepted.
+    :return: (store version, KtcValueStore arguments) or None if the file is missing, older than
+             min_version or written in another format.
+    """
+    try:
+        with open(path, 'rb') as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if len(mapping) < HEADER.size:
+        return None
+
+    magic, format_version, little_endian, version, player_count, value_count, weekly_value_count, metadata_size = \
+        HEADER.unpack_from(mapping)
+    if (magic != MAGIC or format_version != FORMAT_VERSION or little_endian != (sys.byteorder == 'little')
+            or array('i').itemsize != 4):
+        logger.warning(f"Ignoring KTC snapshot {path} in an unsupported format")
+        return None
+    if version < min_version:
+        return None
+
+    # views over the mapping, nothing is copied and the mapping stays open while they are referenced
+    view = memoryview(mapping)
+    offset = HEADER.size
+    index = view[offset:offset + player_count * INDEX_COLUMNS * 4].cast('i')
+    offset += len(index) * 4
+    dates = view[offset:offset + value_count * 4].cast('i')
+    offset += value_count * 4
+    values = view[offset:offset + value_count * 4].cast('i')
+    offset += value_count * 4
+    weekly_dates = view[offset:offset + weekly_value_count * 4].cast('i')
+    offset += weekly_value_count * 4
+    weekly_values = view[offset:offset + weekly_value_count * 4].cast('i')
+    offset += weekly_value_count * 4
+    metadata: dict = json.loads(bytes(view[offset:offset + metadata_size]))
+
+    series: dict = {}
+    weekly_series: dict = {}
+    ktc_player_ids: dict = {}
+    for row in range(player_count):
+        sleeper_player_id, ktc_player_id, start, length, weekly_start, weekly_length = \
+            index[row * INDEX_COLUMNS:(row + 1) * INDEX_COLUMNS]
+        series[sleeper_player_id] = (dates[start:start + length], values[start:start + length])
+        weekly_series[sleeper_player_id] = (weekly_dates[weekly_start:weekly_start + weekly_length],
+                                            weekly_values[weekly_start:weekly_start + weekly_length])
+        ktc_player_ids[sleeper_player_id] = ktc_player_id
+
+    draft_pick_series: dict = {
+        (season, draft_round, tier): (dates[start:start + length], values[start:start + length])
+        for season, draft_round, tier, start, length in metadata['draft_picks']
+    }
+
+    return version, {
+        'player_names': {int(key): name for key, name in metadata['player_names'].items()},
+        'ktc_player_ids': ktc_player_ids,
+        'series': series,
+        'weekly_series': weekly_series,
+        'draft_pick_series': draft_pick_series
+    }
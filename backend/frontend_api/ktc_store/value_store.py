@@ -0,0 +1,278 @@
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+
+from fantasy_trades_app.models import Players, KtcPlayerValues, KtcPlayerWeeklyValues, KtcIngestion
+from frontend_api.ktc_store import snapshot
+from frontend_api.ktc_store.weekly_values import downsample_weekly, refresh_weekly_values
+from logger_util import logger
+
+VERSION_CACHE_KEY = "ktc_values_version"  # the newest KtcIngestion version, read through the shared cache
+LOAD_CHUNK_SIZE = 10000
+DRAFT_PICK_TIERS = ('Early', 'Mid', 'Late')
+DRAFT_PICK_NAME_PATTERN = re.compile(r'^(?P<season>\d{4}) (?P<tier>Early|Mid|Late) (?P<round>\d)(st|nd|rd|th)$')
+
+_store = None
+_checked_at: float = 0.0
+_lock = threading.Lock()
+
+
+class KtcValueStore:
+    """
+    Every KTC value in memory, as per-player arrays of date ordinals and values sorted by date, along
+    with the weekly points of KtcPlayerWeeklyValues.
+
+    The arrays are either built from the database or views over a mapped snapshot file. The store
+    is never modified after it is built, a reload builds a new store and swaps it in.
+    """
+
+    def __init__(self, version: int, player_names: dict, ktc_player_ids: dict, series: dict,
+                 weekly_series: dict, draft_pick_series: dict):
+        """
+        :param version: The ingestion version the store was built from.
+        :param player_names: sleeper player ID -> player name
+        :param ktc_player_ids: sleeper player ID -> ktc player ID, for the players with values
+        :param series: sleeper player ID -> (date ordinals, values)
+        :param weekly_series: sleeper player ID -> (date ordinals, values) of the first value of every week
+        :param draft_pick_series: (season, round, tier) -> (date ordinals, values) of a draft pick
+        """
+        self.version = version
+        self.player_names = player_names
+        self.ktc_player_ids = ktc_player_ids
+        self.series = series
+        self.weekly_series = weekly_series
+        self.draft_pick_series = draft_pick_series
+
+    def get_player_name(self, sleeper_player_id: int) -> str | None:
+        return self.player_names.get(sleeper_player_id)
+
+    def value_on(self, sleeper_player_id: int, on_date: date) -> int | None:
+        """The value on a date, or the last value before it."""
+        dates, values = self.series.get(sleeper_player_id, (None, None))
+        if dates is None:
+            return None
+
+        index = bisect_right(dates, on_date.toordinal())
+        return values[index - 1] if index else None
+
+    def latest(self, sleeper_player_id: int) -> tuple[date, int] | None:
+        dates, values = self.series.get(sleeper_player_id, (None, None))
+        if not dates:
+            return None
+        return date.fromordinal(dates[-1]), values[-1]
+
+    def series_since(self, sleeper_player_id: int, since_date: date) -> tuple[array, array]:
+        """The date ordinals and values on or after since_date."""
+        dates, values = self.series.get(sleeper_player_id, (array('i'), array('i')))
+        index = bisect_left(dates, since_date.toordinal())
+        return dates[index:], values[index:]
+
+    def trade_values(self, sleeper_player_id: int, since_date: date) -> tuple[int, int] | None:
+        """
+        (first value, last value) of weekly_series_since without building the series.
+
+        :return: None if the player has no value on or after since_date.
+        """
+        dates, values = self.series.get(sleeper_player_id, (None, None))
+        if not dates:
+            return None
+
+        index = bisect_left(dates, since_date.toordinal())
+        if index == len(dates):
+            return None
+
+        weekly_dates, weekly_values = self.weekly_series[sleeper_player_id]
+        latest_value = weekly_values[-1] if weekly_dates[-1] > dates[index] else values[index]
+        return values[index], latest_value
+
+    def weekly_series_since(self, sleeper_player_id: int, since_date: date) -> tuple[array, array]:
+        """
+        The first value on or after since_date followed by the weekly points after it. Same as
+        downsampling series_since, without going over the daily values.
+        """
+        dates, values = self.series_since(sleeper_player_id, since_date)
+        if not dates:
+            return array('i'), array('i')
+
+        weekly_dates, weekly_values = self.weekly_series[sleeper_player_id]
+        index = bisect_right(weekly_dates, dates[0])
+        return array('i', (dates[0], *weekly_dates[index:])), array('i', (values[0], *weekly_values[index:]))
+
+    def draft_pick_value_on(self, season: int, draft_round: int, tier: str, on_date: date) -> int | None:
+        """
+        The value of a draft pick on a date, or the last value before it. Picks traded before KTC
+        listed them get the first listed value.
+
+        :param tier: 'Early', 'Mid' or 'Late'
+        :return: The value or None if KTC does not list the pick.
+        """
+        dates, values = self.draft_pick_series.get((season, draft_round, tier), (None, None))
+        if not dates:
+            return None
+
+        index = bisect_right(dates, on_date.toordinal())
+        return values[max(index - 1, 0)]
+
+    def draft_pick_latest(self, season: int, draft_round: int, tier: str) -> tuple[date, int] | None:
+        dates, values = self.draft_pick_series.get((season, draft_round, tier), (None, None))
+        if not dates:
+            return None
+        return date.fromordinal(dates[-1]), values[-1]
+
+
+def parse_draft_pick_name(player_name: str) -> tuple[int, int, str] | None:
+    """(season, round, tier) of a KTC draft pick name like '2025 Mid 1st', None for other players."""
+    match = DRAFT_PICK_NAME_PATTERN.match(player_name)
+    if match is None:
+        return None
+    return int(match.group('season')), int(match.group('round')), match.group('tier')
+
+
+def load_store(version: int) -> KtcValueStore:
+    """Build a store from every KtcPlayerValues row."""
+    start = time.monotonic()
+
+    series_by_ktc_id: dict = {}
+    rows = (KtcPlayerValues.objects
+            .values_list('ktc_player_id', 'date', 'ktc_value')
+            .order_by('ktc_player_id', 'date')
+            .iterator(chunk_size=LOAD_CHUNK_SIZE))
+    for ktc_player_id, value_date, ktc_value in rows:
+        if ktc_player_id not in series_by_ktc_id:
+            series_by_ktc_id[ktc_player_id] = (array('i'), array('i'))
+        dates, values = series_by_ktc_id[ktc_player_id]
+        dates.append(value_date.toordinal())
+        values.append(ktc_value)
+
+    weekly_by_ktc_id: dict = {}
+    weekly_rows = (KtcPlayerWeeklyValues.objects
+                   .values_list('ktc_player_id', 'date', 'ktc_value')
+                   .order_by('ktc_player_id', 'date')
+                   .iterator(chunk_size=LOAD_CHUNK_SIZE))
+    for ktc_player_id, value_date, ktc_value in weekly_rows:
+        if ktc_player_id not in weekly_by_ktc_id:
+            weekly_by_ktc_id[ktc_player_id] = (array('i'), array('i'))
+        dates, values = weekly_by_ktc_id[ktc_player_id]
+        dates.append(value_date.toordinal())
+        values.append(ktc_value)
+
+    player_names: dict = {}
+    ktc_player_ids: dict = {}
+    series: dict = {}
+    weekly_series: dict = {}
+    draft_pick_series: dict = {}
+    players = Players.objects.values_list('sleeper_player_id', 'ktc_player_id', 'player_name').order_by('id')
+    for sleeper_player_id, ktc_player_id, player_name in players.iterator(chunk_size=LOAD_CHUNK_SIZE):
+        draft_pick = parse_draft_pick_name(player_name)
+        if draft_pick is not None and ktc_player_id in series_by_ktc_id:
+            draft_pick_series.setdefault(draft_pick, series_by_ktc_id[ktc_player_id])
+
+        if sleeper_player_id is not None and sleeper_player_id not in player_names:
+            player_names[sleeper_player_id] = player_name
+            if ktc_player_id in series_by_ktc_id:
+                series[sleeper_player_id] = series_by_ktc_id[ktc_player_id]
+                ktc_player_ids[sleeper_player_id] = ktc_player_id
+
+                # values ingested before the weekly table existed are downsampled here
+                weekly_series[sleeper_player_id] = (weekly_by_ktc_id.get(ktc_player_id)
+                                                    or downsample_weekly(*series_by_ktc_id[ktc_player_id]))
+
+    logger.info(f"Loaded KTC value store version={version}: {len(player_names)} players, "
+                f"{len(draft_pick_series)} draft picks, "
+                f"{sum(len(dates) for dates, _ in series_by_ktc_id.values())} values "
+                f"in {time.monotonic() - start:.2f}s")
+
+    return KtcValueStore(version, player_names, ktc_player_ids, series, weekly_series, draft_pick_series)
+
+
+def open_store(version: int) -> KtcValueStore:
+    """
+    Map the snapshot file written by the ingestion, or build the store from the database when the
+    snapshot is missing or older than version. A store built from the database is written as the
+    new snapshot so the other workers can map it.
+
+    A mapped store is labelled with the version in the snapshot header, the version of the values
+    it actually holds.
+    """
+    start = time.monotonic()
+    result = snapshot.read_snapshot(settings.KTC_SNAPSHOT_PATH, version)
+    if result is not None:
+        snapshot_version, store_args = result
+        logger.info(f"Mapped KTC snapshot version={snapshot_version} in {time.monotonic() - start:.3f}s")
+        return KtcValueStore(snapshot_version, **store_args)
+
+    store: KtcValueStore = load_store(version)
+    try:
+        snapshot.write_snapshot(store, settings.KTC_SNAPSHOT_PATH)
+    except OSError as e:
+        logger.warning(f"Unable to write KTC snapshot: {e}")
+    return store
+
+
+def get_version() -> int:
+    """
+    The newest published version, 0 before the first publish. The shared cache can evict the
+    version, it is then read back from KtcIngestion.
+    """
+    version = caches['shared'].get(VERSION_CACHE_KEY)
+    if version is None:
+        version = KtcIngestion.objects.order_by('-version').values_list('version', flat=True).first() or 0
+        caches['shared'].set(VERSION_CACHE_KEY, version, timeout=None)
+    return version
+
+
+def publish() -> None:
+    """
+    Called after KTC values are ingested. Refreshes the weekly values and writes a snapshot of the new
+    values, then publishes the version so every process reloads its store on its next version check.
+    """
+    refresh_weekly_values()
+
+    version: int = time.time_ns()
+    snapshot.write_snapshot(load_store(version), settings.KTC_SNAPSHOT_PATH)
+    KtcIngestion.objects.create(version=version)
+    caches['shared'].set(VERSION_CACHE_KEY, version, timeout=None)
+
+
+def is_fresh() -> bool:
+    return _store is not None and time.monotonic() - _checked_at < settings.KTC_VALUE_STORE_CHECK_INTERVAL
+
+
+def get_store() -> KtcValueStore:
+    """
+    The process-wide store, loaded on first use and reloaded when the ingestion version changes.
+
+    The version is checked at most every settings.KTC_VALUE_STORE_CHECK_INTERVAL seconds. While one
+    thread reloads, the others keep using the current store.
+    """
+    global _store, _checked_at
+
+    if is_fresh():
+        return _store
+
+    if not _lock.acquire(blocking=_store is None):
+        return _store
+    try:
+        if is_fresh():
+            return _store
+
+        version = get_version()
+        if _store is None or _store.version < version:
+            _store = open_store(version)
+        _checked_at = time.monotonic()
+        return _store
+    finally:
+        _lock.release()
+
+
+async def aget_store() -> KtcValueStore:
+    if is_fresh():
+        return _store
+    return await sync_to_async(get_store)()
@@ -0,0 +1,59 @@
+from array import array
+from datetime import date
+
+from django.db import transaction
+
+from fantasy_trades_app.models import KtcPlayerValues, KtcPlayerWeeklyValues
+from logger_util import logger
+
+BATCH_SIZE = 5000
+
+
+def get_week(date_ordinal: int) -> tuple[int, int, int]:
+    """(year, month, week of the year starting on Sunday as strftime('%U')) of a date ordinal."""
+    value_date = date.fromordinal(date_ordinal)
+    return (value_date.year, value_date.month,
+            (value_date.timetuple().tm_yday + 6 - (value_date.weekday() + 1) % 7) // 7)
+
+
+def downsample_weekly(dates, values) -> tuple[array, array]:
+    """
+    Keep the first value of every week, weeks are split at month boundaries.
+
+    :param dates: Date ordinals sorted ascending.
+    :param values: KTC value of each date.
+    """
+    weekly_dates = array('i')
+    weekly_values = array('i')
+    previous_week = None
+    for date_ordinal, ktc_value in zip(dates, values):
+        week = get_week(date_ordinal)
+        if week != previous_week:
+            weekly_dates.append(date_ordinal)
+            weekly_values.append(ktc_value)
+            previous_week = week
+
+    return weekly_dates, weekly_values
+
+
+def refresh_weekly_values() -> None:
+    """Rebuild KtcPlayerWeeklyValues from KtcPlayerValues, called after KTC values are ingested."""
+    rows = (KtcPlayerValues.objects
+            .values_list('ktc_player_id', 'date', 'ktc_value')
+            .order_by('ktc_player_id', 'date')
+            .iterator(chunk_size=BATCH_SIZE))
+
+    weekly_values: list = []
+    previous_key = None
+    for ktc_player_id, value_date, ktc_value in rows:
+        key = (ktc_player_id, get_week(value_date.toordinal()))
+        if key != previous_key:
+            weekly_values.append(KtcPlayerWeeklyValues(ktc_player_id_id=ktc_player_id, date=value_date,
+                                                       ktc_value=ktc_value))
+            previous_key = key
+
+    with transaction.atomic():
+        KtcPlayerWeeklyValues.objects.all().delete()
+        KtcPlayerWeeklyValues.objects.bulk_create(weekly_values, batch_size=BATCH_SIZE)
+
+    logger.info(f"{len(weekly_values)} weekly ktc player values created")
@@ -0,0 +1,77 @@
+import hashlib
+
+from frontend_api.models.LeagueUser import LeagueUser
+
+
+class LeagueIndex:
+    """
+    Lookups used while valuing a league's trades. The draft lookups are built once per league and cached
+    by get_league_draft_index, the users are read with the league's users.
+
+    users_by_roster_id: roster_id -> LeagueUser
+    draft_orders: season -> the season's draft_order (user_id -> draft_slot)
+    drafted_players: (season, round, draft_slot) -> sleeper player ID drafted with that pick
+    """
+
+    def __init__(self, users_by_roster_id: dict, draft_orders: dict, drafted_players: dict):
+        self.users_by_roster_id = users_by_roster_id
+        self.draft_orders = draft_orders
+        self.drafted_players = drafted_players
+        self._fingerprint: str | None = None
+
+    def fingerprint(self) -> str:
+        """Digest of everything in the index, changes when a user, draft order or draft pick changes."""
+        if self._fingerprint is None:
+            content = repr((
+                sorted((roster_id, user.user_id, user.user_name, user.roster_avatar, user.user_avatar)
+                       for roster_id, user in self.users_by_roster_id.items() if roster_id is not None),
+                sorted((season, sorted(draft_order.items()) if draft_order else draft_order)
+                       for season, draft_order in self.draft_orders.items()),
+                sorted(self.drafted_players.items())
+            ))
+            self._fingerprint = hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+        return self._fingerprint
+
+    def get_user(self, roster_id: int) -> LeagueUser:
+        league_user: LeagueUser = self.users_by_roster_id.get(roster_id)
+
+        if not league_user:
+            raise ValueError(f"No user found with roster_id: {roster_id}")
+
+        return league_user
+
+    def has_draft(self, season: str) -> bool:
+        return season in self.draft_orders
+
+    def find_drafted_player(self, traded_draft_pick: dict) -> tuple[int, str]:
+        """
+        Find the draft slot of a traded pick and the player drafted with it.
+
+        :return: (draft_slot, sleeper player ID of the drafted player)
+        """
+        season: str = traded_draft_pick['season']
+        user_id: str = self.get_user(traded_draft_pick['roster_id']).user_id  # the team this pick originally belonged to
+        draft_slot: int = self.draft_orders[season][user_id]
+
+        player_id: str = self.drafted_players.get((season, traded_draft_pick['round'], draft_slot))
+        if player_id is None:
+            raise Exception(
+                f"Unable to find draft pick for roster_id {traded_draft_pick['roster_id']} for draft_slot {draft_slot}")
+
+        return draft_slot, player_id
+
+
+def from_league(league_users: list[LeagueUser], draft_index: dict) -> LeagueIndex:
+    """
+    :param league_users: The league's users.
+    :param draft_index: The league's cached draft lookups, as returned by get_league_draft_index.get_data.
+    """
+    users_by_roster_id: dict = {}
+    for league_user in league_users:
+        users_by_roster_id.setdefault(league_user.roster_id, league_user)
+
+    drafted_players: dict = {}
+    for season, draft_round, draft_slot, player_id in draft_index['drafted_players']:
+        drafted_players.setdefault((season, draft_round, draft_slot), player_id)
+
+    return LeagueIndex(users_by_roster_id, draft_index['draft_orders'], drafted_players)
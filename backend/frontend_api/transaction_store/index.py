@@ -0,0 +1,100 @@
+import json
+
+from django.core.cache import cache
+
+from fantasy_trades_app.models import SleeperLeague, SleeperTransaction
+from frontend_api.cache.constants import TRANSACTION_INDEX_CACHE_KEY, TRANSACTION_INDEX_TTL
+from frontend_api.cache.get_league_data import get_league_data
+from frontend_api.transaction_store.trades import TRADE_ROW_FIELDS, row_to_trade
+
+
+def cache_key(transaction_id: str) -> str:
+    return f"{TRANSACTION_INDEX_CACHE_KEY}_{transaction_id}"
+
+
+def record_fetched(sleeper_league_id: str, trades: list) -> None:
+    """
+    Index trades just read from Sleeper for leagues not synced yet, synced trades are indexed by
+    SleeperTransaction.
+
+    :param sleeper_league_id: The league season the trades belong to.
+    """
+    cache.set_many(to_entries(sleeper_league_id, trades), timeout=TRANSACTION_INDEX_TTL)
+
+
+async def arecord_fetched(sleeper_league_id: str, trades: list) -> None:
+    await cache.aset_many(to_entries(sleeper_league_id, trades), timeout=TRANSACTION_INDEX_TTL)
+
+
+def to_entries(sleeper_league_id: str, trades: list) -> dict:
+    return {
+        cache_key(trade['transaction_id']): {
+            'sleeper_league_id': sleeper_league_id,
+            'week': trade['week'],
+            'created_at_millis': trade['created_at_millis']
+        } for trade in trades
+    }
+
+
+def lookup(transaction_id: str) -> json:
+    """
+    Find a trade by its transaction ID.
+
+    :return: None if the trade is not indexed, else {'league_id': the newest synced season of the trade's league,
+             'sleeper_league_id': the trade's season, 'season', 'week', 'created_at_millis': the trade's sort
+             position, 'trade': the trade if it is synced, None if it has to be read from its week}
+    """
+    row = (SleeperTransaction.objects
+           .filter(transaction_id=transaction_id)
+           .values_list('sleeper_league_id', 'sleeper_league_id__season', *TRADE_ROW_FIELDS)
+           .first())
+    if row is not None:
+        sleeper_league_id, season, *trade_row = row
+        trade: json = row_to_trade(sleeper_league_id, trade_row)
+        return {
+            'league_id': get_newest_league_id(sleeper_league_id),
+            'sleeper_league_id': sleeper_league_id,
+            'season': season,
+            'week': trade['week'],
+            'created_at_millis': trade['created_at_millis'],
+            'trade': trade
+        }
+
+    entry: json = cache.get(cache_key(transaction_id))
+    if entry is None:
+        return None
+    return {
+        **entry,
+        'league_id': get_newest_league_id(entry['sleeper_league_id']),
+        'season': get_league_data(entry['sleeper_league_id'])['season'],
+        'trade': None
+    }
+
+
+def get_sort_key(transaction_id: str) -> tuple[str, tuple[int, str]]:
+    """(the trade's season league ID, its (created_at_millis, transaction_id) sort key), None if not indexed."""
+    row = (SleeperTransaction.objects
+           .filter(transaction_id=transaction_id)
+           .values_list('sleeper_league_id', 'created_at_millis')
+           .first())
+    if row is not None:
+        return row[0], (row[1], transaction_id)
+
+    entry: json = cache.get(cache_key(transaction_id))
+    if entry is None:
+        return None
+    return entry['sleeper_league_id'], (entry['created_at_millis'], transaction_id)
+
+
+def get_newest_league_id(sleeper_league_id: str) -> str:
+    """Follow the synced seasons after a league season to the newest one."""
+    seen: set = {sleeper_league_id}
+    while True:
+        next_league_id: str = (SleeperLeague.objects
+                               .filter(previous_league_id=sleeper_league_id)
+                               .values_list('sleeper_league_id', flat=True)
+                               .first())
+        if next_league_id is None or next_league_id in seen:
+            return sleeper_league_id
+        seen.add(next_league_id)
+        sleeper_league_id = next_league_id
@@ -0,0 +1,108 @@
+import heapq
+import json
+from typing import Iterator
+
+from django.db.models import Q
+
+from fantasy_trades_app.models import SleeperTransaction, SleeperTransactionRoster
+from frontend_api.errors import InvalidRequestError
+from frontend_api.transaction_store.trades import TRADE_ROW_FIELDS, row_to_trade
+
+CHUNK_SIZE = 50  # synced trades read per query while paging through a season
+
+
+def sort_key(trade: json) -> tuple[int, str]:
+    """Trades are paged newest first by (created_at_millis, transaction_id)."""
+    return trade['created_at_millis'], trade['transaction_id']
+
+
+def encode_cursor(trade: json) -> str:
+    return f"{trade['created_at_millis']}_{trade['transaction_id']}"
+
+
+def decode_cursor(cursor: str) -> tuple[int, str]:
+    """:raises InvalidRequestError: The cursor is not one written by encode_cursor."""
+    try:
+        created_at_millis, transaction_id = cursor.split('_', 1)
+        return int(created_at_millis), transaction_id
+    except ValueError:
+        raise InvalidRequestError(f"Invalid cursor '{cursor}'")
+
+
+def older_than(after: tuple[int, str]) -> Q:
+    return Q(created_at_millis__lt=after[0]) | Q(created_at_millis=after[0], transaction_id__lt=after[1])
+
+
+def newer_than(key: tuple[int, str]) -> Q:
+    return Q(created_at_millis__gt=key[0]) | Q(created_at_millis=key[0], transaction_id__gt=key[1])
+
+
+def iter_synced_season(sleeper_league_id: str, after: tuple[int, str] | None, roster_id: int | None) -> Iterator[json]:
+    """
+    A synced season's trades newest first, read CHUNK_SIZE at a time as the iterator is consumed.
+
+    A roster's trades are read through SleeperTransactionRoster, which holds the sort key of each
+    (roster, trade) pair so only the roster's trades are scanned.
+    """
+    if roster_id is None:
+        query = SleeperTransaction.objects.filter(sleeper_league_id=sleeper_league_id)
+        fields: tuple = TRADE_ROW_FIELDS
+    else:
+        query = SleeperTransactionRoster.objects.filter(sleeper_league_id=sleeper_league_id, roster_id=roster_id)
+        fields: tuple = tuple(f"sleeper_transaction__{field}" for field in TRADE_ROW_FIELDS)
+
+    while True:
+        chunk = query.filter(older_than(after)) if after is not None else query
+        rows: list = list(chunk.order_by('-created_at_millis', '-transaction_id').values_list(*fields)[:CHUNK_SIZE])
+
+        for row in rows:
+            yield row_to_trade(sleeper_league_id, row)
+
+        if len(rows) < CHUNK_SIZE:
+            return
+        after = (rows[-1][1], rows[-1][2])  # created_at_millis, transaction_id
+
+
+def iter_loaded_season(trades: list, after: tuple[int, str] | None) -> Iterator[json]:
+    for trade in sorted(trades, key=sort_key, reverse=True):
+        if after is None or sort_key(trade) < after:
+            yield trade
+
+
+def iter_season(season: json, after: tuple[int, str] | None, roster_id: int | None) -> Iterator[json]:
+    if season['trades'] is None:
+        return iter_synced_season(season['sleeper_league_id'], after, roster_id)
+    if roster_id is None:
+        return iter_loaded_season(season['trades'], after)
+    return iter_loaded_season(season['roster_trades'].get(roster_id, []), after)
+
+
+def iter_trades(seasons: list[json], after: tuple[int, str] = None, roster_id: int = None) -> Iterator[json]:
+    """
+    Every season's trades newest first, merged lazily: only the trades consumed are read.
+
+    :param seasons: Seasons as returned by get_transactions_data.get_seasons.
+    :param after: Only trades older than this sort key, the cursor of the previous page.
+    :param roster_id: Only trades of this roster.
+    """
+    return heapq.merge(*[iter_season(season, after, roster_id) for season in seasons], key=sort_key, reverse=True)
+
+
+def count_trades(seasons: list[json], roster_id: int = None) -> int:
+    if roster_id is None:
+        return sum(season['trade_count'] for season in seasons)
+    return sum(season['roster_trade_counts'].get(roster_id, 0) for season in seasons)
+
+
+def count_newer(seasons: list[json], key: tuple[int, str], roster_id: int = None) -> int:
+    """The number of trades before the trade with this sort key, newest first."""
+    synced_league_ids: list = [season['sleeper_league_id'] for season in seasons if season['trades'] is None]
+    if roster_id is None:
+        query = SleeperTransaction.objects.filter(sleeper_league_id__in=synced_league_ids)
+        loaded: list = [season['trades'] for season in seasons if season['trades'] is not None]
+    else:
+        query = SleeperTransactionRoster.objects.filter(sleeper_league_id__in=synced_league_ids, roster_id=roster_id)
+        loaded: list = [season['roster_trades'].get(roster_id, []) for season in seasons if season['trades'] is not None]
+
+    newer: int = query.filter(newer_than(key)).count() if synced_league_ids else 0
+    return newer + sum(1 for trades in loaded for trade in trades if sort_key(trade) > key)
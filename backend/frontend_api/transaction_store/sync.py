@@ -0,0 +1,143 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from fantasy_trades_app.models import SleeperLeague, SleeperTransaction, SleeperTransactionRoster
+from frontend_api.cache.get_league_data import get_league_data
+from frontend_api.transaction_store.trades import NUMBER_OF_WEEKS, FULLY_SYNCED_WEEK, filter_trades
+from logger_util import logger
+from sleeper_api import sleeper_api_svc
+from util import map_concurrently
+
+BATCH_SIZE = 1000
+TRANSACTION_FIELDS = ('week', 'position', 'created_at_millis', 'roster_ids', 'adds', 'draft_picks', 'waiver_budget')
+
+_sync_executor = ThreadPoolExecutor(max_workers=settings.TRANSACTION_SYNC_WORKERS, thread_name_prefix='transaction_sync')
+_syncing: set = set()  # league IDs with a sync queued or running
+_syncing_lock = threading.Lock()
+
+
+def sync_league(sleeper_league_id: str) -> None:
+    """
+    Store the league's trades of every week at or after its last synced week.
+
+    The last synced week is the last week with any transaction, later weeks have not been played yet.
+    Weeks before it never get new transactions, so they are not fetched again. A complete league is
+    synced once more after it completes and never again.
+    """
+    league_data: json = get_league_data(sleeper_league_id)
+    league, _ = SleeperLeague.objects.update_or_create(
+        sleeper_league_id=sleeper_league_id,
+        defaults={
+            'name': league_data['name'],
+            'season': league_data['season'],
+            'status': league_data['status'],
+            'previous_league_id': league_data['previous_league_id']
+        }
+    )
+    if league.last_synced_week is not None and league.last_synced_week >= FULLY_SYNCED_WEEK:
+        return
+
+    start_week: int = league.last_synced_week or 0
+    weeks: list = list(range(start_week, NUMBER_OF_WEEKS))
+    weeks_data: list = map_concurrently(
+        lambda week: sleeper_api_svc.get_transactions(sleeper_league_id, week) or [],
+        weeks,
+        max_workers=settings.SLEEPER_API_MAX_CONCURRENCY
+    )
+
+    last_active_week: int = start_week
+    transactions: list = []
+    for week, week_data in zip(weeks, weeks_data):
+        if week_data:
+            last_active_week = week
+        for position, trade in enumerate(filter_trades(week_data, sleeper_league_id)):
+            transactions.append(SleeperTransaction(
+                transaction_id=trade['transaction_id'],
+                sleeper_league_id=league,
+                week=week,
+                position=position,
+                created_at_millis=trade['created_at_millis'],
+                roster_ids=trade['roster_ids'],
+                adds=trade['adds'],
+                draft_picks=trade['draft_picks'],
+                waiver_budget=trade['waiver_budget']
+            ))
+
+    with transaction.atomic():
+        # syncs of the league in other processes wait here until this one commits
+        league = SleeperLeague.objects.select_for_update().get(pk=league.pk)
+
+        # trades reversed on Sleeper since the last sync
+        (SleeperTransaction.objects
+         .filter(sleeper_league_id=league, week__gte=start_week)
+         .exclude(transaction_id__in=[trade.transaction_id for trade in transactions])
+         .delete())
+        SleeperTransaction.objects.bulk_create(
+            transactions,
+            batch_size=BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['transaction_id'],
+            update_fields=TRANSACTION_FIELDS
+        )
+
+        index_rosters(league, start_week)
+
+        league.last_synced_week = FULLY_SYNCED_WEEK if league.status == 'complete' else last_active_week
+        league.synced_at = timezone.now()
+        league.trade_count = SleeperTransaction.objects.filter(sleeper_league_id=league).count()
+        league.roster_trade_counts = {
+            str(roster_id): trade_count for roster_id, trade_count in
+            SleeperTransactionRoster.objects.filter(sleeper_league_id=sleeper_league_id)
+            .values_list('roster_id').annotate(trade_count=Count('id')).order_by()
+        }
+        league.save(update_fields=['last_synced_week', 'synced_at', 'trade_count', 'roster_trade_counts'])
+
+    logger.info(f"Synced {len(transactions)} trades of weeks {start_week}-{NUMBER_OF_WEEKS - 1} "
+                f"for sleeper league {sleeper_league_id}")
+
+
+def index_rosters(league: SleeperLeague, start_week: int) -> None:
+    """Rebuild the SleeperTransactionRoster rows of the league's trades synced from start_week on."""
+    SleeperTransactionRoster.objects.filter(sleeper_transaction__sleeper_league_id=league,
+                                            sleeper_transaction__week__gte=start_week).delete()
+
+    rows = (SleeperTransaction.objects
+            .filter(sleeper_league_id=league, week__gte=start_week)
+            .values_list('id', 'created_at_millis', 'transaction_id', 'roster_ids'))
+    SleeperTransactionRoster.objects.bulk_create([
+        SleeperTransactionRoster(sleeper_transaction_id=sleeper_transaction_id,
+                                 sleeper_league_id=league.sleeper_league_id, roster_id=roster_id,
+                                 created_at_millis=created_at_millis, transaction_id=transaction_id)
+        for sleeper_transaction_id, created_at_millis, transaction_id, roster_ids in rows
+        for roster_id in roster_ids
+    ], batch_size=BATCH_SIZE)
+
+
+def schedule_sync(sleeper_league_ids: list[str]) -> None:
+    """Sync the leagues in the background, leagues already queued or syncing are skipped."""
+    for sleeper_league_id in sleeper_league_ids:
+        with _syncing_lock:
+            if sleeper_league_id in _syncing:
+                continue
+            _syncing.add(sleeper_league_id)
+        _sync_executor.submit(run_sync, sleeper_league_id)
+
+
+def run_sync(sleeper_league_id: str) -> None:
+    close_old_connections()
+    try:
+        with sleeper_api_svc.background_priority():
+            sync_league(sleeper_league_id)
+    except Exception:
+        # the league keeps its last synced trades, the next request retries the sync
+        logger.warning(f"Transaction sync of sleeper league {sleeper_league_id} failed", exc_info=True)
+    finally:
+        with _syncing_lock:
+            _syncing.discard(sleeper_league_id)
+        close_old_connections()
@@ -0,0 +1,112 @@
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from fantasy_trades_app.models import SleeperLeague, SleeperTransaction
+
+NUMBER_OF_WEEKS = 21
+FULLY_SYNCED_WEEK = NUMBER_OF_WEEKS  # last_synced_week of a complete league with every week synced
+TRADE_ROW_FIELDS = ('week', 'created_at_millis', 'transaction_id', 'roster_ids', 'adds', 'draft_picks', 'waiver_budget')
+
+
+def transform_transaction_data(item: json, sleeper_league_id: str) -> json:
+    return {
+        'created_at_millis': item['status_updated'],
+        'sleeper_league_id': sleeper_league_id,
+        'created_at_yyyy_mm_dd': datetime.fromtimestamp(item['status_updated'] / 1000).strftime('%Y-%m-%d'),
+        'created_at_pretty': datetime.fromtimestamp(item['status_updated'] / 1000).strftime('%b %d %Y'),
+        'draft_picks': item['draft_picks'],
+        'adds': item['adds'],
+        'roster_ids': item['roster_ids'],
+        'transaction_id': item['transaction_id'],
+        'waiver_budget': item['waiver_budget'],
+        'week': item['leg']
+    }
+
+
+def filter_trades(league_transactions_data: json, sleeper_league_id: str) -> list:
+    return [
+        transform_transaction_data(item, sleeper_league_id)
+        for item in league_transactions_data
+        if item.get('type') == 'trade'
+           and item.get('status') == 'complete'
+           and item.get('adds') is not None
+    ]
+
+
+def row_to_trade(sleeper_league_id: str, row: tuple) -> json:
+    """A trade from a SleeperTransaction row of TRADE_ROW_FIELDS values."""
+    week, created_at_millis, transaction_id, roster_ids, adds, draft_picks, waiver_budget = row
+    return transform_transaction_data({
+        'status_updated': created_at_millis,
+        'draft_picks': draft_picks,
+        'adds': adds,
+        'roster_ids': roster_ids,
+        'transaction_id': transaction_id,
+        'waiver_budget': waiver_budget,
+        'leg': week
+    }, sleeper_league_id)
+
+
+def partition_by_roster(trades: list) -> dict:
+    """roster_id -> the trades of the roster, in trades order."""
+    trades_by_roster_id: dict = {}
+    for trade in trades:
+        for roster_id in trade['roster_ids']:
+            trades_by_roster_id.setdefault(roster_id, []).append(trade)
+    return trades_by_roster_id
+
+
+def needs_sync(league: SleeperLeague | None, now: datetime) -> bool:
+    if league is None or league.last_synced_week is None:
+        return True
+    if league.last_synced_week >= FULLY_SYNCED_WEEK:
+        return False
+    return now - league.synced_at > timedelta(seconds=settings.TRANSACTION_SYNC_INTERVAL)
+
+
+def get_synced_leagues(sleeper_league_ids: list[str]) -> tuple[dict, list]:
+    """
+    :return: (league ID -> {'trade_count', 'roster_trade_counts': roster_id -> trade count} of the synced
+             leagues, IDs of the leagues that are due a sync)
+    """
+    leagues: dict = {
+        league.sleeper_league_id: league for league in SleeperLeague.objects.filter(sleeper_league_id__in=sleeper_league_ids)
+    }
+    trade_counts: dict = {
+        sleeper_league_id: {
+            'trade_count': league.trade_count,
+            'roster_trade_counts': {
+                int(roster_id): trade_count for roster_id, trade_count in league.roster_trade_counts.items()
+            }
+        }
+        for sleeper_league_id, league in leagues.items() if league.last_synced_week is not None
+    }
+
+    now: datetime = timezone.now()
+    leagues_to_sync: list = [
+        sleeper_league_id for sleeper_league_id in sleeper_league_ids if needs_sync(leagues.get(sleeper_league_id), now)
+    ]
+
+    return trade_counts, leagues_to_sync
+
+
+def get_synced_trades(sleeper_league_ids: list[str]) -> tuple[dict, list]:
+    """
+    Read the trades of every synced league with a single query, in (week, position) order.
+
+    :return: (league ID -> trades of the synced leagues, IDs of the leagues that are due a sync)
+    """
+    trade_counts, leagues_to_sync = get_synced_leagues(sleeper_league_ids)
+    trades_by_league_id: dict = {sleeper_league_id: [] for sleeper_league_id in trade_counts}
+
+    rows = (SleeperTransaction.objects
+            .filter(sleeper_league_id__in=list(trades_by_league_id))
+            .order_by('week', 'position')
+            .values_list('sleeper_league_id', *TRADE_ROW_FIELDS))
+    for sleeper_league_id, *row in rows:
+        trades_by_league_id[sleeper_league_id].append(row_to_trade(sleeper_league_id, row))
+
+    return trades_by_league_id, leagues_to_sync
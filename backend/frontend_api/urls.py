@@ -1,6 +1,12 @@
+from django.conf import settings
 from django.urls import path
 
 from .views import get_league_trades, get_version, get_trade, get_leagues, get_leaderboard, submit_feedback, get_feedback
+from .views import aget_league_trades, aget_leagues, aget_leaderboard
+
+# async views need an ASGI server to pay off, keep the sync views when running under WSGI
+if settings.ASYNC_VIEWS:
+    get_league_trades, get_leagues, get_leaderboard = aget_league_trades, aget_leagues, aget_leaderboard
 
 urlpatterns = [
     path('get_league_trades/<str:sleeper_league_id>', get_league_trades, name='get_league_trades'),
@@ -2,7 +2,8 @@ import json
 import traceback
 
 from django.core.paginator import Paginator, PageNotAnInteger, EmptyPage
-from django.http import JsonResponse
+from django.http import JsonResponse, HttpRequest
+from django.views.decorators.http import require_GET
 from rest_framework.decorators import api_view
 from rest_framework.request import Request
 
@@ -10,7 +11,11 @@ from fantasy_trades_app.models import Feedback
 from fantasy_trades_app.settings import VERSION
 from frontend_api.api_helpers import get_trades_api_helper, get_leagues_helper, get_leaderboards_helper
 from frontend_api.api_helpers.get_trade_api_helper import get_trade_data
+from frontend_api.errors import InvalidRequestError
 from logger_util import logger
+from sleeper_api.throttling import SleeperUnavailableError
+
+SLEEPER_UNAVAILABLE_MESSAGE = "Sleeper is currently unavailable, please try again in a few minutes"
 
 
 @api_view(['GET'])
@@ -36,7 +41,12 @@ def get_leaderboard(request: Request, sleeper_league_id: str) -> JsonResponse:
             sleeper_league_id=sleeper_league_id
         )
         return JsonResponse(data=leaderboard_result, status=200, safe=False)
-    except Exception as e:
+    except InvalidRequestError as e:
+        return JsonResponse(data={"error": str(e)}, status=400, safe=False)
+    except SleeperUnavailableError:
+        logger.error("Sleeper API unavailable", exc_info=True)
+        return JsonResponse(data={"error": SLEEPER_UNAVAILABLE_MESSAGE}, status=503, safe=False)
+    except Exception:
         logger.error("Exception occurred", exc_info=True)
         logger.error(traceback.format_exc())
         return JsonResponse(
@@ -59,7 +69,12 @@ def get_league_trades(request: Request, sleeper_league_id: str) -> JsonResponse:
             paginate=True
         )
         return JsonResponse(data=trades_result, status=200, safe=False)
-    except Exception as e:
+    except InvalidRequestError as e:
+        return JsonResponse(data={"error": str(e)}, status=400, safe=False)
+    except SleeperUnavailableError:
+        logger.error("Sleeper API unavailable", exc_info=True)
+        return JsonResponse(data={"error": SLEEPER_UNAVAILABLE_MESSAGE}, status=503, safe=False)
+    except Exception:
         logger.error("Exception occurred", exc_info=True)
         logger.error(traceback.format_exc())
         return JsonResponse(
@@ -72,8 +87,14 @@ def get_league_trades(request: Request, sleeper_league_id: str) -> JsonResponse:
 @api_view(['GET'])
 def get_trade(request: Request, transaction_id: str) -> JsonResponse:
     try:
-        return get_trade_data(transaction_id)
-    except Exception as e:
+        trade_result = get_trade_data(transaction_id)
+        if trade_result is None:
+            return JsonResponse({"error": f"Trade {transaction_id} not found"}, status=404, safe=False)
+        return JsonResponse(data=trade_result, status=200, safe=False)
+    except SleeperUnavailableError:
+        logger.error("Sleeper API unavailable", exc_info=True)
+        return JsonResponse(data={"error": SLEEPER_UNAVAILABLE_MESSAGE}, status=503, safe=False)
+    except Exception:
         logger.error("Exception occurred", exc_info=True)
         logger.error(traceback.format_exc())
         return JsonResponse({"error": f"Error while fetching trade {transaction_id}"}, status=500, safe=False)
@@ -83,7 +104,75 @@ def get_trade(request: Request, transaction_id: str) -> JsonResponse:
 def get_leagues(request: Request, user_name: str) -> JsonResponse:
     try:
         return JsonResponse(data=get_leagues_helper.get_leagues(username=user_name), status=200, safe=False)
-    except Exception as e:
+    except SleeperUnavailableError:
+        logger.error("Sleeper API unavailable", exc_info=True)
+        return JsonResponse(data={"error": SLEEPER_UNAVAILABLE_MESSAGE}, status=503, safe=False)
+    except Exception:
+        logger.error(msg="Exception occurred", exc_info=True)
+        logger.error(msg=traceback.format_exc())
+        return JsonResponse(data={"error": "Error while fetching user info"}, status=500, safe=False)
+
+
+# Async variants of the Sleeper backed views, routed in frontend_api/urls.py when settings.ASYNC_VIEWS is enabled
+@require_GET
+async def aget_leaderboard(request: HttpRequest, sleeper_league_id: str) -> JsonResponse:
+    try:
+        leaderboard_result = await get_leaderboards_helper.aget_leaderboard(
+            request=request,
+            sleeper_league_id=sleeper_league_id
+        )
+        return JsonResponse(data=leaderboard_result, status=200, safe=False)
+    except InvalidRequestError as e:
+        return JsonResponse(data={"error": str(e)}, status=400, safe=False)
+    except SleeperUnavailableError:
+        logger.error("Sleeper API unavailable", exc_info=True)
+        return JsonResponse(data={"error": SLEEPER_UNAVAILABLE_MESSAGE}, status=503, safe=False)
+    except Exception:
+        logger.error("Exception occurred", exc_info=True)
+        logger.error(traceback.format_exc())
+        return JsonResponse(
+            data={"error": f"Error while fetching leaderboard for league '{sleeper_league_id}'"},
+            status=500,
+            safe=False
+        )
+
+
+@require_GET
+async def aget_league_trades(request: HttpRequest, sleeper_league_id: str) -> JsonResponse:
+    try:
+        roster_id = request.GET.get('rosterId', 'all')
+        transaction_id = request.GET.get('transactionId', None)
+        trades_result = await get_trades_api_helper.aget_trades(
+            request=request,
+            sleeper_league_id=sleeper_league_id,
+            roster_id=roster_id,
+            transaction_id=transaction_id,
+            paginate=True
+        )
+        return JsonResponse(data=trades_result, status=200, safe=False)
+    except InvalidRequestError as e:
+        return JsonResponse(data={"error": str(e)}, status=400, safe=False)
+    except SleeperUnavailableError:
+        logger.error("Sleeper API unavailable", exc_info=True)
+        return JsonResponse(data={"error": SLEEPER_UNAVAILABLE_MESSAGE}, status=503, safe=False)
+    except Exception:
+        logger.error("Exception occurred", exc_info=True)
+        logger.error(traceback.format_exc())
+        return JsonResponse(
+            data={"error": f"Error while fetching trades for league '{sleeper_league_id}'"},
+            status=500,
+            safe=False
+        )
+
+
+@require_GET
+async def aget_leagues(request: HttpRequest, user_name: str) -> JsonResponse:
+    try:
+        return JsonResponse(data=await get_leagues_helper.aget_leagues(username=user_name), status=200, safe=False)
+    except SleeperUnavailableError:
+        logger.error("Sleeper API unavailable", exc_info=True)
+        return JsonResponse(data={"error": SLEEPER_UNAVAILABLE_MESSAGE}, status=503, safe=False)
+    except Exception:
         logger.error(msg="Exception occurred", exc_info=True)
         logger.error(msg=traceback.format_exc())
         return JsonResponse(data={"error": "Error while fetching user info"}, status=500, safe=False)
@@ -15,6 +15,7 @@ django.setup()
 
 # Import your models after Django has been set up
 from fantasy_trades_app.models import Players, KtcPlayerValues
+from frontend_api.ktc_store import value_store
 
 # Set up logging
 logger = logging.getLogger('data_population_logger')
@@ -181,6 +182,9 @@ def populate_data():
     logger.info(f"{Players.objects.count()} players created")
     logger.info(f"{KtcPlayerValues.objects.count()} ktc player values created")
 
+    # write the KTC snapshot and have the running servers reload it
+    value_store.publish()
+
 if __name__ == '__main__':
     try:
         populate_data()
@@ -1,59 +1,333 @@
+import asyncio
+import contextvars
+import json
+import random
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+import httpx
 import requests
 from django.conf import settings
+from requests.adapters import HTTPAdapter
 
 from logger_util import logger
+from sleeper_api.throttling import (
+    INTERACTIVE, BACKGROUND, TokenBucket, CircuitBreaker, SleeperUnavailableError
+)
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+rate_limiter = TokenBucket(
+    calls_per_minute=max(1, settings.SLEEPER_API_CALLS_PER_MINUTE // settings.SLEEPER_API_WORKER_PROCESSES),
+    background_reserve=settings.SLEEPER_API_BACKGROUND_RESERVE // settings.SLEEPER_API_WORKER_PROCESSES
+)
+circuit_breaker = CircuitBreaker(
+    failure_threshold=settings.SLEEPER_API_BREAKER_FAILURES,
+    reset_timeout=settings.SLEEPER_API_BREAKER_RESET_TIMEOUT
+)
+call_priority = contextvars.ContextVar('sleeper_call_priority', default=INTERACTIVE)
+
+_session = None
+_session_lock = threading.Lock()
+
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
 
+_latency_stats = {}
+_latency_stats_lock = threading.Lock()
 
-def fetch_data_from_sleeper_api(endpoint):
+
+def get_session() -> requests.Session:
+    """
+    Lazily build the process-wide Sleeper session.
+
+    The session keeps connections alive and pools them per host, so the weekly transaction
+    calls for a league reuse one TCP+TLS connection instead of opening a new one each time.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=settings.SLEEPER_API_POOL_SIZE,
+                    max_retries=0  # retries are handled in fetch_data_from_sleeper_api
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({"Accept": "application/json"})
+                _session = session
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Get the pooled async Sleeper client of the running event loop.
+
+    httpx clients are bound to the loop they were first used on, so one client is kept per loop.
+    Under ASGI that is a single client for the whole worker.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = httpx.AsyncClient(
+            headers={"Accept": "application/json"},
+            timeout=httpx.Timeout(settings.SLEEPER_API_READ_TIMEOUT, connect=settings.SLEEPER_API_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=settings.SLEEPER_API_POOL_SIZE,
+                max_keepalive_connections=settings.SLEEPER_API_POOL_SIZE
+            )
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def get_backoff_seconds(attempt: int) -> float:
+    """Exponential backoff with full jitter: random value in [0, base * 2^attempt], capped."""
+    backoff = min(settings.SLEEPER_API_BACKOFF_MAX, settings.SLEEPER_API_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, backoff)
+
+
+def record_latency(stat_name: str, elapsed: float, failed: bool) -> None:
+    with _latency_stats_lock:
+        stats = _latency_stats.setdefault(stat_name, {
+            'calls': 0,
+            'failures': 0,
+            'total_seconds': 0.0,
+            'max_seconds': 0.0
+        })
+        stats['calls'] += 1
+        stats['total_seconds'] += elapsed
+        stats['max_seconds'] = max(stats['max_seconds'], elapsed)
+        if failed:
+            stats['failures'] += 1
+
+
+def get_latency_stats() -> dict:
+    """
+    Per-endpoint call stats since process start.
+
+    :return: dict keyed by endpoint name with calls, failures, avg_seconds and max_seconds.
+    """
+    with _latency_stats_lock:
+        return {
+            stat_name: {
+                'calls': stats['calls'],
+                'failures': stats['failures'],
+                'avg_seconds': stats['total_seconds'] / stats['calls'] if stats['calls'] else 0.0,
+                'max_seconds': stats['max_seconds']
+            }
+            for stat_name, stats in _latency_stats.items()
+        }
+
+
+def fetch_data_from_sleeper_api(endpoint, stat_name=None):
     """
     Helper function to make GET requests to the Sleeper API.
 
+    Requests go through a shared pooled session with connect/read timeouts and the process-wide
+    rate limit. Connection errors, timeouts and 429/5xx responses are retried with jittered
+    exponential backoff. When Sleeper stays unavailable, or the circuit breaker is open,
+    SleeperUnavailableError is raised, CachedResource keeps serving its stale entries meanwhile.
+
+    :param endpoint: The specific API endpoint to hit (e.g., "/players/nfl").
+    :param stat_name: Name to record latency stats under, defaults to the endpoint.
+    :return: Response with the JSON data or an error message.
+    """
+    url = f"{settings.SLEEPER_API_URL}/{endpoint}"
+    stat_name = stat_name or endpoint
+    timeout = (settings.SLEEPER_API_CONNECT_TIMEOUT, settings.SLEEPER_API_READ_TIMEOUT)
+    logger.debug(url)
+
+    circuit_breaker.before_call()
+
+    try:
+        max_retries = settings.SLEEPER_API_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            wait_for_rate_limit()
+            start = time.perf_counter()
+            try:
+                response = get_session().get(url, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                record_latency(stat_name, time.perf_counter() - start, failed=True)
+                if attempt < max_retries:
+                    logger.warning(f"Retrying API '{endpoint}' after error: {e}")
+                    time.sleep(get_backoff_seconds(attempt))
+                    continue
+                raise handle_unavailable(endpoint, str(e))
+
+            record_latency(stat_name, time.perf_counter() - start, failed=response.status_code != 200)
+
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                except ValueError as e:
+                    # e.g. an HTML error page served with a 200 during an outage
+                    raise handle_unavailable(endpoint, f"Invalid JSON response: {e}")
+                return handle_success(data)
+
+            if response.status_code in RETRY_STATUS_CODES:
+                if attempt < max_retries:
+                    logger.warning(f"Retrying API '{endpoint}' after response: {str(response)}")
+                    time.sleep(get_backoff_seconds(attempt))
+                    continue
+                raise handle_unavailable(endpoint, str(response))
+
+            circuit_breaker.record_success()  # Sleeper is up, the request itself is bad
+            logger.error(f"Failed hitting API '{endpoint}'\nResponse={str(response)}")
+            raise Exception(f"Failed getting data for '{endpoint}': {str(response)}")
+    except BaseException:
+        # decode errors, unexpected client errors and cancelled requests must not leave a trial in flight
+        circuit_breaker.release_trial()
+        raise
+
+async def afetch_data_from_sleeper_api(endpoint, stat_name=None):
+    """
+    Async version of fetch_data_from_sleeper_api, same timeouts, retries, rate limit and stats.
+
     :param endpoint: The specific API endpoint to hit (e.g., "/players/nfl").
+    :param stat_name: Name to record latency stats under, defaults to the endpoint.
     :return: Response with the JSON data or an error message.
     """
     url = f"{settings.SLEEPER_API_URL}/{endpoint}"
-    headers = {"Accept" : "application/json"}
+    stat_name = stat_name or endpoint
     logger.debug(url)
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    else:
-        logger.error(f"Failed hitting API '{endpoint}'\nResponse={str(response)}")
-        raise Exception(f"Failed getting data for '{endpoint}': {str(response)}")
+
+    circuit_breaker.before_call()
+
+    try:
+        max_retries = settings.SLEEPER_API_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            await await_rate_limit()
+            start = time.perf_counter()
+            try:
+                response = await get_async_client().get(url)
+            except httpx.TransportError as e:
+                record_latency(stat_name, time.perf_counter() - start, failed=True)
+                if attempt < max_retries:
+                    logger.warning(f"Retrying API '{endpoint}' after error: {e}")
+                    await asyncio.sleep(get_backoff_seconds(attempt))
+                    continue
+                raise handle_unavailable(endpoint, str(e))
+
+            record_latency(stat_name, time.perf_counter() - start, failed=response.status_code != 200)
+
+            if response.status_code == 200:
+                try:
+                    data = response.json()
+                except ValueError as e:
+                    raise handle_unavailable(endpoint, f"Invalid JSON response: {e}")
+                return handle_success(data)
+
+            if response.status_code in RETRY_STATUS_CODES:
+                if attempt < max_retries:
+                    logger.warning(f"Retrying API '{endpoint}' after response: {str(response)}")
+                    await asyncio.sleep(get_backoff_seconds(attempt))
+                    continue
+                raise handle_unavailable(endpoint, str(response))
+
+            circuit_breaker.record_success()  # Sleeper is up, the request itself is bad
+            logger.error(f"Failed hitting API '{endpoint}'\nResponse={str(response)}")
+            raise Exception(f"Failed getting data for '{endpoint}': {str(response)}")
+    except BaseException:
+        # decode errors, unexpected client errors and cancelled requests must not leave a trial in flight
+        circuit_breaker.release_trial()
+        raise
+
+
+def wait_for_rate_limit() -> None:
+    priority = call_priority.get()
+    while (wait_seconds := rate_limiter.try_acquire(priority)) > 0:
+        time.sleep(wait_seconds)
+
+
+async def await_rate_limit() -> None:
+    priority = call_priority.get()
+    while (wait_seconds := rate_limiter.try_acquire(priority)) > 0:
+        await asyncio.sleep(wait_seconds)
+
+
+@contextmanager
+def background_priority():
+    """Run the Sleeper calls made inside the block at background priority, for cache warmers and syncs."""
+    token = call_priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        call_priority.reset(token)
+
+
+def handle_success(data: json) -> json:
+    circuit_breaker.record_success()
+    return data
+
+
+def handle_unavailable(endpoint: str, error: str) -> SleeperUnavailableError:
+    circuit_breaker.record_failure()
+    logger.error(f"Failed hitting API '{endpoint}'\nError={error}")
+    return SleeperUnavailableError(f"Failed getting data for '{endpoint}': {error}")
 
 def get_transactions(league_id, round):
     endpoint = f"league/{league_id}/transactions/{round}"
-    return fetch_data_from_sleeper_api(endpoint)
+    return fetch_data_from_sleeper_api(endpoint, stat_name="league/transactions")
 
 def get_users(league_id):
-    return fetch_data_from_sleeper_api(f"league/{league_id}/users")
+    return fetch_data_from_sleeper_api(f"league/{league_id}/users", stat_name="league/users")
 
 def get_players():
     return fetch_data_from_sleeper_api(f"players/nfl")
 
 # https://docs.sleeper.com/#getting-rosters-in-a-league
 def get_rosters(league_id):
-    return fetch_data_from_sleeper_api(f"league/{league_id}/rosters")
+    return fetch_data_from_sleeper_api(f"league/{league_id}/rosters", stat_name="league/rosters")
 
 def get_matchups(league_id, week):
-    return fetch_data_from_sleeper_api(f"league/{league_id}/transactions/{week}")
+    return fetch_data_from_sleeper_api(f"league/{league_id}/transactions/{week}", stat_name="league/transactions")
 
 def get_league(league_id):
-    return fetch_data_from_sleeper_api(f"league/{league_id}")
+    return fetch_data_from_sleeper_api(f"league/{league_id}", stat_name="league")
 
 def get_drafts(league_id):
-    return fetch_data_from_sleeper_api(f"league/{league_id}/drafts")
+    return fetch_data_from_sleeper_api(f"league/{league_id}/drafts", stat_name="league/drafts")
 
 def get_user_info(username):
-    return fetch_data_from_sleeper_api(f"user/{username}")
+    return fetch_data_from_sleeper_api(f"user/{username}", stat_name="user")
 
 def get_user_leagues(user_id, sport, season):
-    return fetch_data_from_sleeper_api(f"user/{user_id}/leagues/{sport}/{season}")
+    return fetch_data_from_sleeper_api(f"user/{user_id}/leagues/{sport}/{season}", stat_name="user/leagues")
 
 # https://docs.sleeper.com/#get-a-specific-draft
 def get_draft_picks(draft_id):
-    return fetch_data_from_sleeper_api(f"draft/{draft_id}/picks")
+    return fetch_data_from_sleeper_api(f"draft/{draft_id}/picks", stat_name="draft/picks")
 
 # https://docs.sleeper.com/#get-traded-picks-in-a-draft
 def get_traded_draft_picks(draft_id):
-    return fetch_data_from_sleeper_api(f"draft/{draft_id}/traded_picks")
+    return fetch_data_from_sleeper_api(f"draft/{draft_id}/traded_picks", stat_name="draft/traded_picks")
+
+
+async def aget_transactions(league_id, round):
+    endpoint = f"league/{league_id}/transactions/{round}"
+    return await afetch_data_from_sleeper_api(endpoint, stat_name="league/transactions")
+
+async def aget_users(league_id):
+    return await afetch_data_from_sleeper_api(f"league/{league_id}/users", stat_name="league/users")
+
+async def aget_rosters(league_id):
+    return await afetch_data_from_sleeper_api(f"league/{league_id}/rosters", stat_name="league/rosters")
+
+async def aget_league(league_id):
+    return await afetch_data_from_sleeper_api(f"league/{league_id}", stat_name="league")
+
+async def aget_drafts(league_id):
+    return await afetch_data_from_sleeper_api(f"league/{league_id}/drafts", stat_name="league/drafts")
+
+async def aget_user_info(username):
+    return await afetch_data_from_sleeper_api(f"user/{username}", stat_name="user")
+
+async def aget_user_leagues(user_id, sport, season):
+    return await afetch_data_from_sleeper_api(f"user/{user_id}/leagues/{sport}/{season}", stat_name="user/leagues")
+
+async def aget_draft_picks(draft_id):
+    return await afetch_data_from_sleeper_api(f"draft/{draft_id}/picks", stat_name="draft/picks")
@@ -0,0 +1,97 @@
+import threading
+import time
+
+INTERACTIVE = 0  # page loads, a user is waiting on the response
+BACKGROUND = 1  # cache warmers and syncs, yield the budget to interactive calls
+
+
+class SleeperUnavailableError(Exception):
+    """Raised when Sleeper keeps timing out or answering 429/5xx."""
+
+
+class CircuitOpenError(SleeperUnavailableError):
+    """Raised instead of calling Sleeper while the circuit breaker is open."""
+
+
+class TokenBucket:
+    """
+    Process-wide token bucket limiting calls per minute. Every worker process has its own bucket, the
+    host's budget is split evenly between them (settings.SLEEPER_API_WORKER_PROCESSES) rather than
+    shared through the cache, which would cost a cache round trip per Sleeper call.
+
+    Background calls only take a token while more than reserve tokens are left, so a warmer
+    can never use up the budget interactive calls need.
+    """
+
+    def __init__(self, calls_per_minute: int, background_reserve: int):
+        self.capacity = calls_per_minute
+        self.refill_per_second = calls_per_minute / 60
+        self.background_reserve = background_reserve
+        self.tokens = float(calls_per_minute)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self, priority: int) -> float:
+        """
+        Take a token if one is available for the priority.
+
+        :return: 0 when a token was taken, otherwise the seconds to wait before trying again.
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+            self.updated_at = now
+
+            floor = self.background_reserve if priority == BACKGROUND else 0
+            if self.tokens - 1 >= floor:
+                self.tokens -= 1
+                return 0
+            return (floor + 1 - self.tokens) / self.refill_per_second
+
+
+class CircuitBreaker:
+    """
+    Fail fast after repeated Sleeper errors.
+
+    Opens after failure_threshold consecutive failures. Once reset_timeout has passed a single
+    trial call is let through (half open), its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def before_call(self) -> None:
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout or self.trial_in_flight:
+                raise CircuitOpenError("Sleeper API circuit breaker is open")
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        End a call that raised before recording its outcome. A trial call re-opens the circuit,
+        otherwise the breaker would stay half open with a trial that never finishes.
+        """
+        with self.lock:
+            if self.trial_in_flight:
+                self.opened_at = time.monotonic()
+                self.trial_in_flight = False
@@ -1,5 +1,23 @@
+import contextvars
 import json
+from concurrent.futures import ThreadPoolExecutor
+
 
 def load_json(json_file_path):
     with open(json_file_path, 'r') as file:
-        return json.load(file)
\ No newline at end of file
+        return json.load(file)
+
+
+def map_concurrently(fn, items: list, max_workers: int) -> list:
+    """
+    Call fn on every item using a bounded thread pool.
+
+    Results are returned in the same order as items. Each call runs in a copy of the caller's
+    context so context variables set by the caller are visible in the worker threads.
+    """
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [future.result() for future in futures]